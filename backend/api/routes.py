@@ -2,11 +2,20 @@
 Project Athena - API Routes
 RESTful API endpoints for the Athena platform
 """
-import os
+import functools
+import hashlib
+import logging
 import re
 import time
+from collections import defaultdict, deque
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends, Request
+from uuid import uuid4
+
+import orjson
+import redis.asyncio as aioredis
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request, Response
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, field_validator
 from core.auth import auth_manager
@@ -16,18 +25,41 @@ from core.aws_ingester import aws_ingester
 from core.detection import detection_engine, DEFAULT_MIN_PRIVILEGE_DELTA
 from core.response import response_engine
 from core.audit import audit_logger
+from core.cache import response_cache
 from core.metrics import metrics
+from config import CLOUDTRAIL_USE_MOCK_DATA, REDIS_URL
 
 # Wire detection -> response integration without module-level back imports.
 detection_engine.set_response_plan_handler(response_engine.create_response_plan)
 
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 RATE_LIMIT_WINDOW_SECONDS = 60
 REGISTER_RATE_LIMIT = 5
 LOGIN_RATE_LIMIT = 20
-_rate_limit_buckets: dict[str, list[float]] = {}
+# Drop idle in-process buckets every N rate-limit checks
+RATE_LIMIT_SWEEP_INTERVAL = 1000
+# A hung Redis must not stall login; timeouts fall back to in-process limits
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.5
+# Shared sliding-window store so limits hold across uvicorn workers; the
+# in-process buckets are only used when Redis is not configured or unreachable.
+_redis = aioredis.from_url(
+    REDIS_URL,
+    socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+    socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS
+) if REDIS_URL else None
+_rate_limit_buckets: defaultdict[str, deque[float]] = defaultdict(deque)
+_rate_limit_checks = 0
+_USERNAME_RE = re.compile(r"[A-Za-z0-9_.-]{3,32}")
+_UPPER_RE = re.compile(r"[A-Z]")
+_LOWER_RE = re.compile(r"[a-z]")
+_DIGIT_RE = re.compile(r"[0-9]")
+_SPECIAL_RE = re.compile(r"[^A-Za-z0-9]")
+IDENTITY_NODE_TYPES = ("iam_user", "iam_role", "iam_group")
+# Serialized graph views keyed by endpoint: (graph version, body, etag)
+_graph_cache: dict[str, tuple[int, bytes, str]] = {}
 
 
 class RegisterRequest(BaseModel):
@@ -38,7 +70,7 @@ class RegisterRequest(BaseModel):
     @classmethod
     def validate_username(cls, value: str) -> str:
         value = value.strip()
-        if not re.fullmatch(r"[A-Za-z0-9_.-]{3,32}", value):
+        if not _USERNAME_RE.fullmatch(value):
             raise ValueError("Username must be 3-32 chars and use [A-Za-z0-9_.-]")
         return value
 
@@ -47,28 +79,70 @@ class RegisterRequest(BaseModel):
     def validate_password(cls, value: str) -> str:
         if len(value) < 12:
             raise ValueError("Password must be at least 12 characters")
-        checks = [
-            re.search(r"[A-Z]", value),
-            re.search(r"[a-z]", value),
-            re.search(r"[0-9]", value),
-            re.search(r"[^A-Za-z0-9]", value),
-        ]
-        if not all(checks):
+        if not (
+            _UPPER_RE.search(value)
+            and _LOWER_RE.search(value)
+            and _DIGIT_RE.search(value)
+            and _SPECIAL_RE.search(value)
+        ):
             raise ValueError("Password must include upper, lower, number, and special character")
         return value
 
 
-def _enforce_rate_limit(key: str, max_requests: int) -> None:
+async def _enforce_rate_limit(key: str, max_requests: int) -> None:
     now = time.time()
     window_start = now - RATE_LIMIT_WINDOW_SECONDS
-    attempts = _rate_limit_buckets.get(key, [])
-    attempts = [attempt for attempt in attempts if attempt >= window_start]
+
+    if _redis is not None:
+        try:
+            allowed = await _redis_record_attempt(f"ratelimit:{key}", now, window_start, max_requests)
+        except aioredis.RedisError as e:
+            logger.warning("Redis rate limiter unavailable, using in-process limits: %s", e)
+        else:
+            if not allowed:
+                raise HTTPException(status_code=429, detail="Too many requests. Try again later.")
+            return
+
+    global _rate_limit_checks
+    _rate_limit_checks += 1
+    if _rate_limit_checks % RATE_LIMIT_SWEEP_INTERVAL == 0:
+        _sweep_rate_limit_buckets(window_start)
+
+    # Attempts are appended in time order, so stale ones are always at the front
+    attempts = _rate_limit_buckets[key]
+    while attempts and attempts[0] < window_start:
+        attempts.popleft()
 
     if len(attempts) >= max_requests:
         raise HTTPException(status_code=429, detail="Too many requests. Try again later.")
 
     attempts.append(now)
-    _rate_limit_buckets[key] = attempts
+
+
+def _sweep_rate_limit_buckets(window_start: float) -> None:
+    """Remove buckets whose newest attempt has left the window"""
+    idle = [key for key, attempts in _rate_limit_buckets.items() if not attempts or attempts[-1] < window_start]
+    for key in idle:
+        del _rate_limit_buckets[key]
+
+
+async def _redis_record_attempt(redis_key: str, now: float, window_start: float, max_requests: int) -> bool:
+    """Sliding-window check on a Redis sorted set; records the attempt when allowed"""
+    member = uuid4().hex
+    # Trim, record and count in one MULTI so concurrent attempts across
+    # workers each see the others' writes; the post-insert count decides
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(redis_key, 0, window_start)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.expire(redis_key, RATE_LIMIT_WINDOW_SECONDS)
+        _, _, count, _ = await pipe.execute()
+
+    if count > max_requests:
+        # Rejected attempts do not hold a slot in the window
+        await _redis.zrem(redis_key, member)
+        return False
+    return True
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
     payload = auth_manager.verify_token(token)
@@ -76,6 +150,35 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     return payload
 
+def _etag_response(
+    request: Request,
+    body: bytes,
+    etag: Optional[str] = None,
+    cache_control: Optional[str] = None
+) -> Response:
+    """JSON response carrying an ETag (hashed from the body unless given); 304 when If-None-Match matches"""
+    if etag is None:
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _graph_json_response(request: Request, key: str, build, cache_control: Optional[str] = None) -> Response:
+    """Serve a graph view from cache until the graph version changes"""
+    version = identity_graph.version
+    cached = _graph_cache.get(key)
+    if cached is None or cached[0] != version:
+        body = orjson.dumps(build())
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        cached = (version, body, etag)
+        _graph_cache[key] = cached
+
+    _, body, etag = cached
+    return _etag_response(request, body, etag=etag, cache_control=cache_control)
+
 def check_admin(current_user: dict = Depends(get_current_user)):
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Administrative privileges required")
@@ -84,12 +187,15 @@ def check_admin(current_user: dict = Depends(get_current_user)):
 # ============ Auth Endpoints ============
 
 @router.post("/auth/login")
-def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     client_ip = request.client.host if request.client else "unknown"
-    _enforce_rate_limit(f"login:{client_ip}", LOGIN_RATE_LIMIT)
+    await _enforce_rate_limit(f"login:{client_ip}", LOGIN_RATE_LIMIT)
 
     user = auth_manager.get_user(form_data.username)
-    if not user or not auth_manager.verify_password(form_data.password, user["hashed_password"]):
+    # Password hashing is CPU-bound; keep it off the event loop.
+    if not user or not await run_in_threadpool(
+        auth_manager.verify_password, form_data.password, user["hashed_password"]
+    ):
         raise HTTPException(status_code=401, detail="Incorrect username or password")
     
     access_token = auth_manager.create_access_token(
@@ -99,10 +205,10 @@ def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
 
 
 @router.post("/auth/register")
-def register(payload: RegisterRequest, request: Request):
+async def register(payload: RegisterRequest, request: Request):
     """Register a new user (Public)"""
     client_ip = request.client.host if request.client else "unknown"
-    _enforce_rate_limit(f"register:{client_ip}", REGISTER_RATE_LIMIT)
+    await _enforce_rate_limit(f"register:{client_ip}", REGISTER_RATE_LIMIT)
 
     username = payload.username
     password = payload.password
@@ -110,7 +216,7 @@ def register(payload: RegisterRequest, request: Request):
     if auth_manager.get_user(username):
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    success = auth_manager.create_user(username, password)
+    success = await run_in_threadpool(auth_manager.create_user, username, password)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to create user")
     
@@ -147,44 +253,53 @@ def update_user_role(username: str, role: str, admin: dict = Depends(check_admin
 # ============ Graph Endpoints ============
 
 @router.get("/graph")
-def get_graph():
+async def get_graph(request: Request):
     """Get the complete identity graph for visualization"""
-    return identity_graph.to_dict()
+    return _graph_json_response(request, "graph", identity_graph.to_dict)
 
 
 @router.get("/graph/stats")
-def get_graph_stats():
+async def get_graph_stats(request: Request):
     """Get graph statistics"""
-    return {
+    return _graph_json_response(request, "stats", lambda: {
         "total_nodes": identity_graph.node_count,
         "total_edges": identity_graph.edge_count
-    }
+    }, cache_control="public, max-age=10")
 
 
 # ============ Identity Endpoints ============
 
 @router.get("/identities")
-def list_identities():
+async def list_identities(request: Request):
     """List all identities in the graph"""
-    graph_data = identity_graph.to_dict()
-    identities = [
-        node for node in graph_data['nodes']
-        if node['type'] in ['iam_user', 'iam_role', 'iam_group']
-    ]
+    return _graph_json_response(request, "identities", _build_identity_list)
+
+
+def _build_identity_list() -> dict:
+    identities = identity_graph.nodes_of_type(*IDENTITY_NODE_TYPES)
     return {"identities": identities, "count": len(identities)}
 
 
 @router.get("/identities/{identity_id}")
-def get_identity(identity_id: str):
+async def get_identity(identity_id: str):
     """Get specific identity details"""
+    payload = _identity_payload(identity_id, identity_graph.version)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Identity not found")
+    return payload
+
+
+@functools.lru_cache(maxsize=4096)
+def _identity_payload(identity_id: str, graph_version: int) -> Optional[dict]:
+    """Identity details memoized per graph version; ingest bumps the version so stale entries age out"""
     node = identity_graph.get_node(identity_id)
     if not node:
-        raise HTTPException(status_code=404, detail="Identity not found")
-    
+        return None
+
     # Get relationships
     neighbors = identity_graph.get_neighbors(identity_id)
     predecessors = identity_graph.get_predecessors(identity_id)
-    
+
     return {
         "identity": node,
         "can_reach": neighbors,
@@ -195,11 +310,14 @@ def get_identity(identity_id: str):
 # ============ AWS Ingestion Endpoints ============
 
 @router.post("/ingest/aws")
-def ingest_aws_data(current_user: dict = Depends(get_current_user)):
-    """Ingest live IAM data from AWS account"""
+async def ingest_aws_data(background_tasks: BackgroundTasks, force_refresh: bool = False, current_user: dict = Depends(get_current_user)):
+    """Ingest live IAM data from AWS account (a recent ingest is reused unless force_refresh)"""
     try:
-        results = aws_ingester.ingest_all()
-        audit_logger.log(
+        # boto3 is blocking; keep it off the event loop.
+        results = await run_in_threadpool(aws_ingester.ingest_all, force_refresh=force_refresh)
+        # Audit writes run after the response is sent
+        background_tasks.add_task(
+            audit_logger.log,
             action="aws_ingest",
             actor="system_admin",
             status="success",
@@ -214,18 +332,18 @@ def ingest_aws_data(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/events/cloudtrail")
-def get_cloudtrail_events(hours: int = 24):
+async def get_cloudtrail_events(request: Request, hours: int = 24):
     """Get recent CloudTrail IAM events or mock events for development"""
     try:
-        # Check if we should use mock data
-        use_mock = os.getenv("USE_MOCK_DATA", "false").lower() == "true"
+        use_mock = CLOUDTRAIL_USE_MOCK_DATA
 
         if use_mock:
             events = aws_ingester.get_mock_events(hours=hours)
         else:
-            events = aws_ingester.get_recent_events(hours=hours)
+            events = await run_in_threadpool(aws_ingester.get_recent_events_list, hours=hours)
 
-        return {"events": events, "count": len(events), "mode": "mock" if use_mock else "live"}
+        payload = {"events": events, "count": len(events), "mode": "mock" if use_mock else "live"}
+        return _etag_response(request, orjson.dumps(payload))
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -233,46 +351,55 @@ def get_cloudtrail_events(hours: int = 24):
 # ============ Detection Endpoints ============
 
 @router.post("/detect/scan")
-def scan_for_attacks(start_node: Optional[str] = None, min_delta: int = DEFAULT_MIN_PRIVILEGE_DELTA, current_user: dict = Depends(get_current_user)):
+async def scan_for_attacks(background_tasks: BackgroundTasks, start_node: Optional[str] = None, min_delta: int = DEFAULT_MIN_PRIVILEGE_DELTA, current_user: dict = Depends(get_current_user)):
     """Scan for privilege escalation attack paths"""
-    paths = detection_engine.find_escalation_paths(
+    # Graph traversal is CPU-bound; run it off the event loop
+    paths = await run_in_threadpool(
+        detection_engine.find_escalation_paths,
         start_node=start_node,
         min_privilege_delta=min_delta
     )
-    audit_logger.log(
+    background_tasks.add_task(
+        audit_logger.log,
         action="attack_scan",
         actor="system_admin",
         status="success",
         details=f"Detected {len(paths)} attack paths."
     )
-    return {
+    # New alerts, and the response plans created for them
+    response_cache.clear("alerts")
+    response_cache.clear("response")
+    # Returning the response directly lets orjson encode the dataclasses in one pass
+    return ORJSONResponse({
         "status": "scan_complete",
         "paths_detected": len(paths),
-        "paths": [p.to_dict() for p in paths]
-    }
+        "paths": paths
+    })
 
 
 @router.get("/alerts")
 def get_all_alerts():
     """Get all detected attack path alerts"""
-    alerts = detection_engine.get_all_alerts()
-    return {"alerts": alerts, "count": len(alerts)}
+    alerts = response_cache.get_or_set("alerts", "all", detection_engine.get_all_alerts)
+    return ORJSONResponse({"alerts": alerts, "count": len(alerts)})
 
 
 @router.get("/alerts/priority")
 def get_priority_alerts():
     """Get high-priority alerts requiring immediate attention"""
-    alerts = detection_engine.get_high_priority_alerts()
-    return {"alerts": alerts, "count": len(alerts)}
+    alerts = response_cache.get_or_set("alerts", "priority", detection_engine.get_high_priority_alerts)
+    return ORJSONResponse({"alerts": alerts, "count": len(alerts)})
 
 
 @router.get("/alerts/{alert_id}")
-def get_alert(alert_id: str):
+def get_alert(alert_id: str, request: Request):
     """Get specific alert details"""
-    alert = detection_engine.get_alert_by_id(alert_id)
+    alert = response_cache.get_or_set(
+        "alerts", f"alert:{alert_id}", lambda: detection_engine.get_alert_by_id(alert_id)
+    )
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
-    return alert
+    return _etag_response(request, orjson.dumps(alert))
 
 
 # ============ Response Endpoints ============
@@ -280,21 +407,22 @@ def get_alert(alert_id: str):
 @router.get("/response/pending")
 def get_pending_responses(admin: dict = Depends(check_admin)):
     """Get response plans pending human approval"""
-    pending = response_engine.get_pending_approvals()
-    return {"pending": pending, "count": len(pending)}
+    pending = response_cache.get_or_set("response", "pending", response_engine.get_pending_approvals)
+    return ORJSONResponse({"pending": pending, "count": len(pending)})
 
 
 @router.get("/response/history")
 def get_response_history(admin: dict = Depends(check_admin)):
     """Get historical response actions"""
-    history = response_engine.get_response_history()
-    return {"history": history, "count": len(history)}
+    history = response_cache.get_or_set("response", "history", response_engine.get_response_history)
+    return ORJSONResponse({"history": history, "count": len(history)})
 
 
 @router.post("/response/approve/{plan_id}")
 def approve_response(plan_id: str, admin: dict = Depends(check_admin)):
     """Approve a pending response plan"""
     result = response_engine.approve_plan(plan_id)
+    response_cache.clear("response")
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -304,6 +432,7 @@ def approve_response(plan_id: str, admin: dict = Depends(check_admin)):
 def reject_response(plan_id: str, reason: str = "Rejected by analyst", admin: dict = Depends(check_admin)):
     """Reject a pending response plan"""
     result = response_engine.reject_plan(plan_id, reason)
+    response_cache.clear("response")
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -313,19 +442,22 @@ def reject_response(plan_id: str, reason: str = "Rejected by analyst", admin: di
 def execute_response(plan_id: str, admin: dict = Depends(check_admin)):
     """Execute an approved response plan"""
     result = response_engine.execute_plan(plan_id)
+    response_cache.clear("response")
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 
 @router.post("/response/rollback/{action_id}")
-def rollback_action(action_id: str, admin: dict = Depends(check_admin)):
+def rollback_action(action_id: str, background_tasks: BackgroundTasks, admin: dict = Depends(check_admin)):
     """Rollback a previously executed action"""
     result = response_engine.rollback_action(action_id)
+    response_cache.clear("response")
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     
-    audit_logger.log(
+    background_tasks.add_task(
+        audit_logger.log,
         action="action_rollback",
         actor="system_admin",
         target=action_id,
@@ -336,18 +468,27 @@ def rollback_action(action_id: str, admin: dict = Depends(check_admin)):
 # ============ Audit Endpoints ============
 
 @router.get("/audit/logs")
-def get_audit_logs(admin: dict = Depends(check_admin)):
-    """Get system audit logs"""
-    return {"logs": audit_logger.get_logs()}
+async def get_audit_logs(request: Request, limit: int = 500, admin: dict = Depends(check_admin)):
+    """Get the most recent system audit logs"""
+    # Logs are append-only, so the newest id plus the limit identifies the payload
+    etag = f'W/"audit-{audit_logger.last_id}-{limit}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return StreamingResponse(
+        audit_logger.iter_json(limit),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 # ============ Health Endpoint ============
 
+_HEALTH_BASE = {"status": "healthy", "service": "athena-core"}
+
+
 @router.get("/health")
-def health():
+async def health(response: Response):
     """Get system health and uptime"""
-    return {
-        "status": "healthy",
-        "service": "athena-core",
-        "uptime_seconds": int(time.time() - metrics.start_time)
-    }
+    response.headers["Cache-Control"] = "public, max-age=10"
+    # Clients render uptime as whole seconds, so keep the integer contract
+    return {**_HEALTH_BASE, "uptime_seconds": int(time.monotonic() - metrics.start_monotonic)}
@@ -1,12 +1,12 @@
-import urllib.request
-import json
+import httpx
 
 API_URL = "http://localhost:5000"
 
+client = httpx.Client(base_url=API_URL)
+
 def get_request(endpoint):
     try:
-        with urllib.request.urlopen(f"{API_URL}{endpoint}") as response:
-            return json.loads(response.read().decode())
+        return client.get(endpoint).json()
     except Exception as e:
         print(f"GET {endpoint} failed: {e}")
         return {}
@@ -1,13 +1,24 @@
-import requests
+import asyncio
+
+import httpx
+
+API_URL = "http://localhost:5000"
+
+
+async def main():
+    # One pooled client, requests issued concurrently
+    async with httpx.AsyncClient(base_url=API_URL) as client:
+        health, stats, identities = await asyncio.gather(
+            client.get("/api/health"),
+            client.get("/api/graph/stats"),
+            client.get("/api/identities"),
+        )
+    print(f"Health: {health.json()}")
+    print(f"Stats: {stats.json()}")
+    print(f"Identities: {identities.json().get('count', 0)}")
+
 
 try:
-    resp = requests.get("http://localhost:5000/api/health")
-    print(f"Health: {resp.json()}")
-    
-    resp = requests.get("http://localhost:5000/api/graph/stats")
-    print(f"Stats: {resp.json()}")
-    
-    resp = requests.get("http://localhost:5000/api/identities")
-    print(f"Identities: {resp.json().get('count', 0)}")
+    asyncio.run(main())
 except Exception as e:
     print(f"Error checking status: {e}")
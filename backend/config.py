@@ -1,7 +1,20 @@
+import functools
 import logging
 import os
 import secrets
 
+
+@functools.lru_cache(maxsize=None)
+def _env(name, default=None, cast=str):
+    """Read an environment variable once and cache the converted value."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    if cast is bool:
+        return value.lower() == "true"
+    return cast(value)
+
+
 # Auto-Response Configuration
 AUTO_RESPONSE_CONFIG = {
     "enabled": True,
@@ -30,21 +43,34 @@ AUTO_RESPONSE_CONFIG = {
 }
 
 # AWS Configuration
-AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
-USE_MOCK_DATA = os.getenv("USE_MOCK_DATA", "True").lower() == "true"
-AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL", "http://localhost:4566")
+AWS_REGION = _env("AWS_REGION", "us-east-1")
+USE_MOCK_DATA = _env("USE_MOCK_DATA", True, bool)
+# The CloudTrail events endpoint has always served live events unless
+# USE_MOCK_DATA=true was set explicitly, so it keeps that default
+CLOUDTRAIL_USE_MOCK_DATA = _env("USE_MOCK_DATA", False, bool)
+AWS_ENDPOINT_URL = _env("AWS_ENDPOINT_URL", "http://localhost:4566")
+# Repeat ingests within this many seconds return the previous result
+INGEST_CACHE_TTL_SECONDS = _env("INGEST_CACHE_TTL_SECONDS", 300.0, float)
 
 # API Configuration
-API_HOST = os.getenv("API_HOST", "0.0.0.0")
-API_PORT = int(os.getenv("PORT", 5000))
+API_HOST = _env("API_HOST", "0.0.0.0")
+API_PORT = _env("PORT", 5000, int)
+# Identity graph, alerts and rate limits live in process memory, so each
+# extra worker holds its own copy; raise only with shared state in place.
+UVICORN_WORKERS = _env("UVICORN_WORKERS", 1, int)
+# Worker threads available to sync handlers and run_in_threadpool offloads
+THREADPOOL_LIMIT = _env("THREADPOOL_LIMIT", 200, int)
+
+# Redis (shared rate limiting across workers; in-process fallback when unset)
+REDIS_URL = _env("REDIS_URL")
 
 # Metrics
-METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+METRICS_ENABLED = _env("METRICS_ENABLED", True, bool)
 
 # Security
 logger = logging.getLogger(__name__)
 
-JWT_SECRET = os.getenv("JWT_SECRET")
+JWT_SECRET = _env("JWT_SECRET")
 if not JWT_SECRET:
     if USE_MOCK_DATA:
         # Generate an ephemeral secret in mock mode so development still works
@@ -54,5 +80,5 @@ if not JWT_SECRET:
     else:
         raise RuntimeError("JWT_SECRET must be set when USE_MOCK_DATA=false")
 
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24))
+JWT_ALGORITHM = _env("JWT_ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRE_MINUTES = _env("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24, int)
@@ -4,16 +4,72 @@ Tracks all system actions, scans, and responses.
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
-import json
+from typing import Iterator, Optional, List, Union
+from collections import deque
+from itertools import islice
+import atexit
+import functools
+import gc
+import logging
+import os
+import queue
+import threading
+import time
 from pathlib import Path
 
-AUDIT_LOGS_FILE = Path(__file__).resolve().parent.parent / "audit_logs.json"
+import orjson
 
-@dataclass
+from core.jsonutil import json_array_items
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOGS_FILE = Path(__file__).resolve().parent.parent / "audit_logs.jsonl"
+AUDIT_WRITE_BUFFER_BYTES = 64 * 1024
+AUDIT_QUEUE_SIZE = 10_000
+AUDIT_WRITE_BATCH = 256
+AUDIT_READ_CACHE_SIZE = 5000
+# Upper bound on how long flush/close wait for the writer, e.g. at exit
+AUDIT_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# Queued after the last entry by close(); the writer exits once it is reached
+_STOP = object()
+
+
+def _format_timestamp(timestamp_ns: int) -> str:
+    seconds, remainder = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000).isoformat()
+
+
+def _parse_log_id(value: Union[int, str, None]) -> int:
+    if isinstance(value, int):
+        return value
+    # Entries written before ids were stored as integers use "LOG-000042"
+    if value and value.startswith("LOG-"):
+        try:
+            return int(value[4:])
+        except ValueError:
+            pass
+    return 0
+
+
+def _parse_timestamp(value: Union[int, str, None]) -> int:
+    if isinstance(value, int):
+        return value
+    if value:
+        # Entries written before timestamps were stored as epoch nanoseconds
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return time.time_ns()
+        whole_seconds = int(parsed.replace(microsecond=0).timestamp())
+        return whole_seconds * 1_000_000_000 + parsed.microsecond * 1000
+    return time.time_ns()
+
+
+@dataclass(slots=True)
 class AuditLog:
-    id: str
-    timestamp: datetime
+    id: int  # rendered as "LOG-%06d" only when read
+    timestamp: int  # epoch nanoseconds; rendered as ISO 8601 only when read
     action: str
     actor: str
     target: Optional[str]
@@ -21,9 +77,21 @@ class AuditLog:
     details: Optional[str]
 
     def to_dict(self):
+        return {
+            "id": f"LOG-{self.id:06d}",
+            "timestamp": _format_timestamp(self.timestamp),
+            "action": self.action,
+            "actor": self.actor,
+            "target": self.target,
+            "status": self.status,
+            "details": self.details
+        }
+
+    def to_record(self):
+        """On-disk form: same fields as to_dict but with the raw integer timestamp."""
         return {
             "id": self.id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.timestamp,
             "action": self.action,
             "actor": self.actor,
             "target": self.target,
@@ -32,70 +100,248 @@ class AuditLog:
         }
 
 class AuditLogger:
-    def __init__(self):
+    def __init__(self, log_path: Path = AUDIT_LOGS_FILE):
+        self.log_path = Path(log_path)
         self._logs: List[AuditLog] = []
         self._counter = 0
+        self._lock = threading.Lock()
+        # One long-lived append handle, opened on first write: each entry is a
+        # single buffered line write instead of re-serializing the whole history.
+        self._fh = None
+        self._io_lock = threading.Lock()
+        # Disk writes happen on a background worker so request handlers never
+        # wait on file I/O; the worker coalesces queued entries per write().
+        self._queue: queue.Queue = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+        # Newest-first API dicts for the most recent entries, rendered lazily
+        # on read; _rendered counts how many of _logs are already in it.
+        self._recent: deque = deque(maxlen=AUDIT_READ_CACHE_SIZE)
+        self._rendered = 0
+        self._closed = False
         self._load_logs()
+        self._writer_thread = threading.Thread(target=self._drain, name="audit-writer", daemon=True)
+        self._writer_thread.start()
+        atexit.register(self.close)
 
     def log(self, action: str, actor: str, target: Optional[str] = None, status: str = "success", details: Optional[str] = None):
-        self._counter += 1
-        log_entry = AuditLog(
-            id=f"LOG-{self._counter:06d}",
-            timestamp=datetime.now(),
-            action=action,
-            actor=actor,
-            target=target,
-            status=status,
-            details=details
-        )
-        self._logs.append(log_entry)
-        self._save_logs()
-        
-        # In a real system, we would write to a DB or persistent file here
-        # For MVP, we keep in memory (and could dump to JSON)
-        print(f"AUDIT LOG: {action} by {actor} on {target} - {status}")
-
-    def get_logs(self) -> List[dict]:
-        return [log.to_dict() for log in reversed(self._logs)]
-
-    def _save_logs(self) -> None:
-        data = [log.to_dict() for log in self._logs]
-        with open(AUDIT_LOGS_FILE, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+        with self._lock:
+            self._counter += 1
+            log_entry = AuditLog(
+                id=self._counter,
+                timestamp=time.time_ns(),
+                action=action,
+                actor=actor,
+                target=target,
+                status=status,
+                details=details
+            )
+            self._logs.append(log_entry)
+            try:
+                if self._closed:
+                    # The writer has stopped; nothing would drain the queue
+                    raise queue.Full
+                self._queue.put_nowait(log_entry)
+            except queue.Full:
+                # Backpressure: write inline rather than drop the entry.
+                self._write_batch([log_entry])
 
-    def _load_logs(self) -> None:
-        if not AUDIT_LOGS_FILE.exists():
+        # %-style args so the message is only formatted when debug logging is on
+        logger.debug("AUDIT LOG: %s by %s on %s - %s", action, actor, target, status)
+
+    @property
+    def last_id(self) -> int:
+        """Id of the newest entry; logs are append-only, so this versions them."""
+        return self._counter
+
+    def get_logs(self, limit: int = 500) -> List[dict]:
+        """Return up to ``limit`` entries, newest first."""
+        return list(self.iter_logs(limit))
+
+    def iter_logs(self, limit: Optional[int] = None) -> Iterator[dict]:
+        """Yield up to ``limit`` entries (all when None), newest first."""
+        with self._lock:
+            # Only render what the cache will keep: after startup or a burst of
+            # writes, older entries would be pushed straight back out of it
+            total = len(self._logs)
+            for index in range(max(self._rendered, total - AUDIT_READ_CACHE_SIZE), total):
+                self._recent.appendleft(self._logs[index].to_dict())
+            self._rendered = total
+            limit = None if limit is None else max(limit, 0)
+            cached = list(islice(self._recent, limit))
+
+        yield from cached
+        # Deeper than the cache: render the remainder straight from history
+        stop = -1 if limit is None else max(total - limit, 0) - 1
+        for index in range(total - len(cached) - 1, stop, -1):
+            yield self._logs[index].to_dict()
+
+    def iter_json(self, limit: Optional[int] = None, batch_size: int = 1000) -> Iterator[bytes]:
+        """Stream ``{"logs": [...]}`` as JSON chunks without building the full list"""
+        yield b'{"logs":['
+        yield from json_array_items(self.iter_logs(limit), batch_size)
+        yield b']}'
+
+    def flush(self, timeout: float = AUDIT_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait up to timeout for every entry queued so far to reach disk; False if it did not."""
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            written = False
+        else:
+            written = marker.wait(timeout)
+        if not written:
+            logger.warning("Audit log flush timed out after %.1fs", timeout)
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.flush()
+        return written
+
+    def close(self, timeout: float = AUDIT_FLUSH_TIMEOUT_SECONDS) -> None:
+        """Write out queued entries, stop the writer and close the file; bounded by timeout."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._writer_thread.join(timeout)
+        if self._writer_thread.is_alive():
+            logger.warning("Audit log writer did not stop within %.1fs", timeout)
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < AUDIT_WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [item for item in batch if type(item) is AuditLog]
+            try:
+                if entries:
+                    self._write_batch(entries)
+            except Exception:
+                # Never let one bad batch kill the writer: later entries would
+                # queue forever and shutdown would wait on them
+                logger.exception("Failed to persist %d audit log entries", len(entries))
+            finally:
+                for item in batch:
+                    if type(item) is threading.Event:
+                        item.set()  # flush() marker: everything before it is written
+                    self._queue.task_done()
+            if _STOP in batch:
+                return
+
+    def _write_batch(self, entries: List[AuditLog]) -> None:
+        with self._io_lock:
+            writer = self._writer()
+            # repr() anything orjson cannot encode (e.g. non-str details) rather than fail the batch
+            writer.writelines([orjson.dumps(entry.to_record(), default=repr) + b"\n" for entry in entries])
+            writer.flush()
+
+    def _writer(self):
+        if self._fh is None:
+            self._fh = open(self.log_path, "ab", buffering=AUDIT_WRITE_BUFFER_BYTES)
+            # Terminate a torn trailing line so the next entry starts cleanly.
+            if self._fh.tell() > 0:
+                with open(self.log_path, "rb") as file:
+                    file.seek(-1, 2)
+                    if file.read(1) != b"\n":
+                        self._fh.write(b"\n")
+        return self._fh
+
+    def _import_legacy_logs(self) -> None:
+        """
+        One-time upgrade from the old audit_logs.json array: its entries are
+        rewritten as JSONL so history and ids carry over. Runs only while the
+        JSONL file does not exist yet; the old file is left in place.
+        """
+        legacy_path = self.log_path.with_suffix(".json")
+        if self.log_path.exists() or not legacy_path.exists():
             return
 
         try:
-            with open(AUDIT_LOGS_FILE, "r", encoding="utf-8") as file:
-                data = json.load(file)
-        except (json.JSONDecodeError, OSError):
+            data = orjson.loads(legacy_path.read_bytes())
+        except (orjson.JSONDecodeError, OSError) as exc:
+            logger.warning("Could not import legacy audit log %s: %s", legacy_path, exc)
+            return
+        if not isinstance(data, list):
+            return
+
+        lines = [
+            orjson.dumps(AuditLog(
+                id=_parse_log_id(item.get("id")),
+                timestamp=_parse_timestamp(item.get("timestamp")),
+                action=item.get("action", ""),
+                actor=item.get("actor", ""),
+                target=item.get("target"),
+                status=item.get("status", "success"),
+                details=item.get("details"),
+            ).to_record()) + b"\n"
+            for item in data
+            if isinstance(item, dict)
+        ]
+        # Write aside and rename, so a crash never leaves a partial JSONL that
+        # would stop the import from being retried
+        staging_path = self.log_path.with_suffix(".jsonl.tmp")
+        with open(staging_path, "wb") as file:
+            file.writelines(lines)
+        os.replace(staging_path, self.log_path)
+        logger.info("Imported %d audit log entries from %s", len(lines), legacy_path)
+
+    def _load_logs(self) -> None:
+        self._import_legacy_logs()
+        if not self.log_path.exists():
             return
 
         loaded_logs = []
-        max_counter = 0
-        for item in data:
-            loaded_logs.append(
-                AuditLog(
-                    id=item.get("id", ""),
-                    timestamp=datetime.fromisoformat(item.get("timestamp")) if item.get("timestamp") else datetime.now(),
-                    action=item.get("action", ""),
-                    actor=item.get("actor", ""),
-                    target=item.get("target"),
-                    status=item.get("status", "success"),
-                    details=item.get("details"),
-                )
-            )
-            log_id = item.get("id", "")
-            if log_id.startswith("LOG-"):
-                try:
-                    max_counter = max(max_counter, int(log_id.split("-")[1]))
-                except (IndexError, ValueError):
-                    pass
+        # Bulk-building one object per line would trigger repeated cyclic GC
+        # passes over objects that cannot form cycles; pause it for the load.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(self.log_path, "rb") as file:
+                for line in file:
+                    try:
+                        item = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # Blank lines, or a torn final line from a crash mid-write
+                        continue
+
+                    # Current entries store ints; only legacy strings need parsing
+                    log_id = item.get("id")
+                    timestamp = item.get("timestamp")
+                    loaded_logs.append(
+                        AuditLog(
+                            id=log_id if type(log_id) is int else _parse_log_id(log_id),
+                            timestamp=timestamp if type(timestamp) is int else _parse_timestamp(timestamp),
+                            action=item.get("action", ""),
+                            actor=item.get("actor", ""),
+                            target=item.get("target"),
+                            status=item.get("status", "success"),
+                            details=item.get("details"),
+                        )
+                    )
+        except OSError:
+            return
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
         self._logs = loaded_logs
-        self._counter = max_counter
+        self._counter = max((entry.id for entry in loaded_logs), default=0)
+
+@functools.cache
+def get_audit_logger() -> AuditLogger:
+    """Process-wide logger; repeated calls never reload the log file."""
+    return AuditLogger()
+
 
 # Singleton instance
-audit_logger = AuditLogger()
+audit_logger = get_audit_logger()
@@ -4,47 +4,165 @@ Handles password hashing and user persistence.
 """
 import os
 import json
+import base64
+import hashlib
+import hmac
+import threading
+import time
 import jwt
-from datetime import datetime, timedelta
+import orjson
+from collections import OrderedDict
+from datetime import timedelta
 from passlib.context import CryptContext
+from passlib.exc import MissingBackendError
 from typing import Optional, Dict
 import logging
 import config
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+_PBKDF2_HANDLER = pwd_context.handler("pbkdf2_sha256")
+_BCRYPT_HANDLER = pwd_context.handler("bcrypt")
 logger = logging.getLogger(__name__)
 
+TOKEN_CACHE_SIZE = 4096
+USERS_JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
 class AuthManager:
     def __init__(self, db_path: str = "users.json"):
         self.db_path = db_path
+        # Mutations are appended here and folded into db_path on compaction
+        self.journal_path = f"{os.path.splitext(db_path)[0]}.log.jsonl"
+        self._save_lock = threading.Lock()
         self._users = self._load_users()
+        self._warm_hash_backends()
+        # Verified payloads keyed by token digest, oldest first; see verify_token
+        self._token_cache: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+        self._token_lock = threading.Lock()
+        # Token settings are fixed for the process; bind them once so the
+        # per-request paths avoid module attribute lookups and re-encoding.
+        self._jwt_secret = config.JWT_SECRET.encode()
+        self._jwt_algorithm = config.JWT_ALGORITHM
+        self._jwt_algorithms = [config.JWT_ALGORITHM]
+        # Signing uses the same secret and algorithm as verify_token. The header
+        # and HMAC key schedule are built once, so signing a token is one HMAC
+        # copy/update plus base64.
+        self._jwt_header_b64 = _b64url(orjson.dumps({"alg": self._jwt_algorithm, "typ": "JWT"}))
+        digest = _HMAC_DIGESTS.get(self._jwt_algorithm)
+        self._jwt_signer = hmac.new(self._jwt_secret, digestmod=digest) if digest is not None else None
+        self._default_expiry_seconds = config.ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
     def _load_users(self) -> Dict[str, dict]:
+        users: Dict[str, dict] = {}
         if os.path.exists(self.db_path):
             with open(self.db_path, 'r') as f:
-                return json.load(f)
-        return {}
+                users = json.load(f)
+        # Hash of the snapshot as written, before the journal is replayed on top
+        self._last_hash = self._users_digest(self._users_bytes(users))
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue  # torn final line from a crash mid-append
+                    self._apply_mutation(users, record)
+        return users
+
+    @staticmethod
+    def _apply_mutation(users: Dict[str, dict], record: dict) -> None:
+        # Replay must be idempotent: a crash between compaction's snapshot write
+        # and journal truncation replays records already in the snapshot.
+        op = record.get("op")
+        username = record.get("username")
+        if op == "create":
+            users[username] = {
+                "username": username,
+                "hashed_password": record["hashed_password"],
+                "role": record["role"],
+            }
+        elif op == "delete":
+            users.pop(username, None)
+        elif op == "update" and username in users:
+            users[username]["role"] = record["role"]
+
+    @staticmethod
+    def _warm_hash_backends() -> None:
+        """Pay passlib's one-time backend setup at startup instead of on the first login."""
+        pwd_context.hash("warmup")
+        try:
+            _BCRYPT_HANDLER.get_backend()
+        except (ValueError, MissingBackendError) as exc:
+            logger.warning("bcrypt backend unavailable; legacy bcrypt hashes cannot be verified: %s", exc)
+
+    @staticmethod
+    def _users_bytes(users: Dict[str, dict]) -> bytes:
+        return orjson.dumps(users, option=orjson.OPT_INDENT_2)
+
+    @staticmethod
+    def _users_digest(payload: bytes) -> bytes:
+        return hashlib.blake2b(payload, digest_size=8).digest()
+
+    def _commit_mutation(self, record: dict) -> None:
+        """Apply one mutation and append it to the journal; compact once it grows large.
+
+        Caller holds _save_lock together with its existence check, so memory and
+        the journal see mutations in the same order.
+        """
+        self._apply_mutation(self._users, record)
+        with open(self.journal_path, "ab") as f:
+            f.write(orjson.dumps(record) + b"\n")
+            size = f.tell()
+        if size > USERS_JOURNAL_COMPACT_BYTES:
+            self._save_users()
 
     def _save_users(self):
-        with open(self.db_path, 'w') as f:
-            json.dump(self._users, f, indent=4)
+        """Write a full snapshot and truncate the journal. Caller holds _save_lock."""
+        payload = self._users_bytes(self._users)
+        digest = self._users_digest(payload)
+        if digest != self._last_hash:
+            # Write-then-rename so a crash never leaves a truncated users file
+            tmp_path = f"{self.db_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.db_path)
+            self._last_hash = digest
+        open(self.journal_path, "wb").close()
 
     def hash_password(self, password: str) -> str:
         return pwd_context.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        # The scheme is evident from the hash prefix, so call its handler
+        # directly rather than have CryptContext probe every scheme.
+        if hashed_password.startswith("$pbkdf2-sha256$"):
+            return _PBKDF2_HANDLER.verify(plain_password, hashed_password)
+        if hashed_password.startswith(("$2a$", "$2b$", "$2y$")):
+            return _BCRYPT_HANDLER.verify(plain_password, hashed_password)
         return pwd_context.verify(plain_password, hashed_password)
 
     def create_user(self, username: str, password: str, role: str = "analyst"):
         if username in self._users:
             return False
         
-        self._users[username] = {
+        # Hash before taking the lock; it is the slow part
+        record = {
+            "op": "create",
             "username": username,
             "hashed_password": self.hash_password(password),
             "role": role
         }
-        self._save_users()
+        with self._save_lock:
+            if username in self._users:
+                return False
+            self._commit_mutation(record)
         return True
 
     def list_users(self) -> list:
@@ -59,41 +177,67 @@ class AuthManager:
         if username == "admin":
             return False  # Protect the default admin
         
-        if username in self._users:
-            del self._users[username]
-            self._save_users()
-            return True
-        return False
+        with self._save_lock:
+            if username not in self._users:
+                return False
+            self._commit_mutation({"op": "delete", "username": username})
+        return True
 
     def update_user_role(self, username: str, new_role: str) -> bool:
         """Update a user's role"""
-        if username in self._users:
-            self._users[username]["role"] = new_role
-            self._save_users()
-            return True
-        return False
+        with self._save_lock:
+            if username not in self._users:
+                return False
+            # Setting a role to its current value needs no journal entry
+            if self._users[username]["role"] != new_role:
+                self._commit_mutation({"op": "update", "username": username, "role": new_role})
+        return True
 
     def get_user(self, username: str) -> Optional[dict]:
         return self._users.get(username)
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None):
         to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
-        
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
-        return encoded_jwt
+        lifetime = self._default_expiry_seconds if expires_delta is None else expires_delta.total_seconds()
+        to_encode["exp"] = int(time.time() + lifetime)
+        if self._jwt_signer is None:
+            return jwt.encode(to_encode, self._jwt_secret, algorithm=self._jwt_algorithm)
+
+        signing_input = self._jwt_header_b64 + b"." + _b64url(orjson.dumps(to_encode))
+        mac = self._jwt_signer.copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
 
     def verify_token(self, token: str) -> Optional[dict]:
+        # A JWT is always three dot-separated segments; skip decoding anything else
+        if token.count(".") != 2:
+            return None
+
+        # UIs resend the same bearer on every call; once a token's signature has
+        # been checked, a repeat only needs its expiry compared against the clock.
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.time()
+        with self._token_lock:
+            hit = self._token_cache.get(key)
+            if hit is not None:
+                if hit[0] > now:
+                    self._token_cache.move_to_end(key)
+                    return hit[1]
+                del self._token_cache[key]
+                return None
+
         try:
-            payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
-            return payload
+            payload = jwt.decode(token, self._jwt_secret, algorithms=self._jwt_algorithms)
         except jwt.PyJWTError:
             return None
 
+        exp = payload.get("exp", float("inf"))
+        with self._token_lock:
+            self._token_cache[key] = (exp, payload)
+            if len(self._token_cache) > TOKEN_CACHE_SIZE:
+                self._token_cache.popitem(last=False)
+        return payload
+
 # Singleton instance
 auth_manager = AuthManager()
 
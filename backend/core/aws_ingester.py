@@ -2,23 +2,109 @@
 Project Athena - AWS IAM Integration
 Live data ingestion from AWS IAM and CloudTrail, with mock data support
 """
-import json
-import boto3
+import functools
+import hashlib
+import itertools
 import logging
+import orjson
 import os
+import re
+import threading
 import time
-from botocore.exceptions import ClientError, NoCredentialsError
+import urllib.parse
+from botocore.exceptions import ClientError
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
 
+from core.aws_session import get_client
 from core.graph import identity_graph, IdentityNode, NodeType, EdgeType
 from core.metrics import metrics
 from core.mock_data import mock_data_generator
-from config import AWS_ENDPOINT_URL, USE_MOCK_DATA
+from config import INGEST_CACHE_TTL_SECONDS, USE_MOCK_DATA
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parsed policy documents keyed by ARN and default version, kept across restarts
+POLICY_CACHE_FILE = Path(__file__).resolve().parent.parent / "policy_cache.json"
+
+# Lower-cased Allow actions that grant each escalation-relevant permission
+ASSUME_ROLE_ACTIONS = frozenset({"sts:assumerole", "sts:*", "*"})
+PASS_ROLE_ACTIONS = frozenset({"iam:passrole", "iam:*", "*"})
+RUN_INSTANCES_ACTIONS = frozenset({"ec2:runinstances", "ec2:*", "*"})
+# Any of the above; other wildcards such as "s3:*" pass the statement pre-check too
+_ESCALATION_ACTIONS = ASSUME_ROLE_ACTIONS | PASS_ROLE_ACTIONS | RUN_INSTANCES_ACTIONS
+
+# Role-name keywords by tier; the first tier with any keyword in the name
+# sets the role's base privilege
+_ROLE_NAME_TIERS = (
+    (("admin", "root", "super"), 95),
+    (("power", "engineer", "production", "maintenance"), 75),
+    (("billing", "security", "auditor"), 65),
+    (("readonly", "viewer"), 25),
+    (("ec2",), 50),
+)
+_ROLE_KEYWORD_TIER = {keyword: tier for tier, (keywords, _) in enumerate(_ROLE_NAME_TIERS) for keyword in keywords}
+# Lookahead so overlapping keywords are all found in one scan, e.g. "viewer" and "root" in "vieweroot"
+_ROLE_KEYWORD_RE = re.compile("(?=(" + "|".join(_ROLE_KEYWORD_TIER) + "))")
+
+# Trust policy principal ARN -> ("user" | "role", name); the name drops any path
+_PRINCIPAL_RE = re.compile(r":(?P<kind>user|role)/(?:.*/)?(?P<name>[^/]*)$")
+
+# Concurrent per-entity IAM follow-up calls; kept well under IAM's request rate
+IAM_INGEST_CONCURRENCY = 20
+
+# Items per IAM list call; 1000 is the MaxItems ceiling of the IAM list APIs
+IAM_PAGE_SIZE = 1000
+
+# Top-level ingest phases (users, roles, groups, policies) run side by side
+INGEST_PHASES = 4
+
+
+@dataclass(slots=True)
+class _IngestBatch:
+    """Graph changes gathered by one entity's follow-up calls, applied later"""
+    edges: list = field(default_factory=list)
+    ec2_escalators: list = field(default_factory=list)
+
+    def add_edge(self, source_id: str, target_id: str, edge_type: EdgeType) -> None:
+        self.edges.append((source_id, target_id, edge_type))
+
+
+@dataclass(slots=True, frozen=True)
+class PolicyEdges:
+    """What a policy document contributes to the graph, precomputed once per ARN"""
+    assumable_role_ids: tuple[str, ...]  # CAN_ASSUME targets, e.g. "role:Deploy"
+    ec2_escalation: bool  # One statement allows both PassRole and RunInstances
+
+
+@dataclass(slots=True, frozen=True)
+class CloudTrailEvent:
+    """One IAM CloudTrail event; orjson encodes it like the equivalent dict"""
+    event_id: Optional[str]
+    event_name: Optional[str]
+    event_time: Optional[str]  # ISO 8601
+    username: Optional[str]
+    resources: list
+
+
+@functools.lru_cache(maxsize=4096)
+def _policy_privilege_by_arn(policy_arn: str) -> int:
+    """Privilege level (0-100) implied by a policy ARN; pure, so memoized"""
+    if 'AdministratorAccess' in policy_arn:
+        return 100
+    elif 'PowerUserAccess' in policy_arn:
+        return 80
+    elif 'ReadOnlyAccess' in policy_arn:
+        return 20
+    elif 'FullAccess' in policy_arn:
+        return 70
+    return 40
+
 
 class AWSIngester:
     """
@@ -31,205 +117,251 @@ class AWSIngester:
         self._iam_client = None
         self._cloudtrail_client = None
         self._initialized = False
-        self._policy_cache = {}  # Cache for parsed policy documents
+        self._policy_cache: dict[str, PolicyEdges] = {}  # Parsed policy edges by ARN, for one ingest
+        self._policy_fetches: dict[str, Future] = {}  # In-flight fetches by ARN
+        self._policy_lock = threading.Lock()
+        # Documents are re-fetched only when a policy's default version changes
+        self._stored_policies: dict[str, dict] = {} if USE_MOCK_DATA else self._load_stored_policies()
+        self._stored_policies_dirty = False
+        # Default version of every attached policy, listed at the start of each
+        # ingest so documents can be fetched without a get_policy call apiece
+        self._default_version_ids: dict[str, str] = {}
+        # Per-entity follow-ups are network bound, so fan them out; threads
+        # only call IAM and the main thread applies results in list order.
+        self._executor = ThreadPoolExecutor(max_workers=IAM_INGEST_CONCURRENCY, thread_name_prefix="iam-ingest")
+        # Edges wait until every node exists: add_edge drops edges whose
+        # endpoints are missing, e.g. user -> policy before policies are listed.
+        self._pending = _IngestBatch()
+        self._pending_lock = threading.Lock()  # Phases queue batches concurrently
+        # Ids of roles named like EC2 or Admin roles, in graph insertion order
+        self._ec2_candidate_roles: dict[str, None] = {}
+        # One shared dict per distinct trust policy, referenced by role metadata
+        self._trust_policies: dict[bytes, dict] = {}
+        # Last ingest_all result and its time.monotonic() stamp; the lock also
+        # keeps concurrent callers from running two ingests at once
+        self._ingest_lock = threading.Lock()
+        self._last_ingest_result: Optional[dict] = None
+        self._last_ingest_at = 0.0
     
     @property
     def iam(self):
         """Lazy-load IAM client"""
         if self._iam_client is None:
-            try:
-                endpoint = AWS_ENDPOINT_URL if not USE_MOCK_DATA else None
-                client_kwargs = {
-                    "region_name": self.region,
-                    "endpoint_url": endpoint
-                }
-                access_key = os.getenv("AWS_ACCESS_KEY_ID")
-                secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-                if access_key and secret_key:
-                    client_kwargs["aws_access_key_id"] = access_key
-                    client_kwargs["aws_secret_access_key"] = secret_key
-
-                self._iam_client = boto3.client("iam", **client_kwargs)
-                self._initialized = True
-            except NoCredentialsError:
-                raise RuntimeError("AWS credentials not configured")
+            self._iam_client = self._create_client("iam")
         return self._iam_client
     
     @property
     def cloudtrail(self):
         """Lazy-load CloudTrail client"""
         if self._cloudtrail_client is None:
-            try:
-                endpoint = AWS_ENDPOINT_URL if not USE_MOCK_DATA else None
-                client_kwargs = {
-                    "region_name": self.region,
-                    "endpoint_url": endpoint
-                }
-                access_key = os.getenv("AWS_ACCESS_KEY_ID")
-                secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-                if access_key and secret_key:
-                    client_kwargs["aws_access_key_id"] = access_key
-                    client_kwargs["aws_secret_access_key"] = secret_key
-
-                self._cloudtrail_client = boto3.client("cloudtrail", **client_kwargs)
-            except NoCredentialsError:
-                raise RuntimeError("AWS credentials not configured")
+            self._cloudtrail_client = self._create_client("cloudtrail")
         return self._cloudtrail_client
+
+    def _create_client(self, service_name: str):
+        """Take the process-wide client, shared with the remediator"""
+        client = get_client(service_name, self.region)
+        self._initialized = True
+        return client
     
     def ingest_users(self) -> int:
-        """Ingest all IAM users into graph"""
+        """Ingest all IAM users into graph (edges are applied by ingest_all)"""
         count = 0
         try:
             paginator = self.iam.get_paginator('list_users')
-            for page in paginator.paginate():
-                for user in page['Users']:
-                    node = IdentityNode(
-                        id=f"user:{user['UserName']}",
-                        node_type=NodeType.IAM_USER,
-                        name=user['UserName'],
-                        arn=user['Arn'],
-                        created_at=user.get('CreateDate', datetime.now()),
-                        privilege_level=self._calculate_user_privilege(user['UserName']),
-                        metadata={
-                            "user_id": user['UserId'],
-                            "path": user.get('Path', '/')
-                        }
-                    )
-                    identity_graph.add_node(node)
-                    count += 1
-                    
-                    # Ingest user's attached policies
-                    self._ingest_user_policies(user['UserName'])
+            now = datetime.now()  # CreateDate fallback, read once per ingest
+            for page in paginator.paginate(PaginationConfig={'PageSize': IAM_PAGE_SIZE}):
+                nodes = []
+                for node, batch in self._executor.map(self._fetch_user, page['Users'], itertools.repeat(now)):
+                    nodes.append(node)
+                    self._queue_batch(batch)
+                identity_graph.add_nodes_bulk(nodes)
+                count += len(nodes)
                     
         except ClientError as e:
-            logger.error(f"Error ingesting users: {e}")
+            logger.warning("Error ingesting users: %s", e)
         
         return count
+
+    def _fetch_user(self, user: dict, now: datetime) -> tuple[IdentityNode, _IngestBatch]:
+        batch = _IngestBatch()
+        # Ingest user's attached policies; the same listing sets privilege
+        attached = self._ingest_user_policies(user['UserName'], batch)
+        node = IdentityNode(
+            id=f"user:{user['UserName']}",
+            node_type=NodeType.IAM_USER,
+            name=user['UserName'],
+            arn=user['Arn'],
+            created_at=user.get('CreateDate', now),
+            privilege_level=self._user_privilege_from_attached(attached),
+            metadata={
+                "user_id": user['UserId'],
+                "path": user.get('Path', '/')
+            }
+        )
+        return node, batch
     
     def ingest_roles(self) -> int:
-        """Ingest all IAM roles into graph"""
+        """Ingest all IAM roles into graph (edges are applied by ingest_all)"""
         count = 0
         try:
             paginator = self.iam.get_paginator('list_roles')
-            for page in paginator.paginate():
-                for role in page['Roles']:
-                    # Skip AWS service-linked roles for clarity
-                    if '/aws-service-role/' in role.get('Path', ''):
-                        continue
-                    
-                    node = IdentityNode(
-                        id=f"role:{role['RoleName']}",
-                        node_type=NodeType.IAM_ROLE,
-                        name=role['RoleName'],
-                        arn=role['Arn'],
-                        created_at=role.get('CreateDate', datetime.now()),
-                        privilege_level=self._calculate_role_privilege(role['RoleName']),
-                        metadata={
-                            "role_id": role['RoleId'],
-                            "path": role.get('Path', '/'),
-                            "assume_role_policy": role.get('AssumeRolePolicyDocument', {})
-                        }
-                    )
-                    identity_graph.add_node(node)
-                    count += 1
-                    
-                    # Add assume role edges
-                    self._ingest_role_trust(role)
-                    
-                    # Ingest role's attached policies
-                    self._ingest_role_policies(role['RoleName'])
+            now = datetime.now()  # CreateDate fallback, read once per ingest
+            for page in paginator.paginate(PaginationConfig={'PageSize': IAM_PAGE_SIZE}):
+                # Skip AWS service-linked roles for clarity
+                roles = [role for role in page['Roles'] if '/aws-service-role/' not in role.get('Path', '')]
+                nodes = []
+                for node, batch in self._executor.map(self._fetch_role, roles, itertools.repeat(now)):
+                    nodes.append(node)
+                    self._queue_batch(batch)
+                self._add_role_nodes(nodes)
+                count += len(nodes)
                     
         except ClientError as e:
-            logger.error(f"Error ingesting roles: {e}")
+            logger.warning("Error ingesting roles: %s", e)
         
         return count
+
+    def _fetch_role(self, role: dict, now: datetime) -> tuple[IdentityNode, _IngestBatch]:
+        batch = _IngestBatch()
+        # Add assume role edges
+        self._ingest_role_trust(role, batch)
+        # Ingest role's attached policies; the same listing sets privilege
+        attached = self._ingest_role_policies(role['RoleName'], batch)
+        node = IdentityNode(
+            id=f"role:{role['RoleName']}",
+            node_type=NodeType.IAM_ROLE,
+            name=role['RoleName'],
+            arn=role['Arn'],
+            created_at=role.get('CreateDate', now),
+            privilege_level=self._role_privilege_from_attached(role['RoleName'], attached),
+            metadata={
+                "role_id": role['RoleId'],
+                "path": role.get('Path', '/'),
+                "assume_role_policy": self._shared_trust_policy(role.get('AssumeRolePolicyDocument', {}))
+            }
+        )
+        return node, batch
+
+    def _shared_trust_policy(self, document: dict) -> dict:
+        """Return the stored copy of an identical trust policy, so roles share one dict"""
+        key = hashlib.blake2b(orjson.dumps(document, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+        return self._trust_policies.setdefault(key, document)
     
     def ingest_policies(self) -> int:
         """Ingest customer-managed IAM policies"""
         count = 0
         try:
             paginator = self.iam.get_paginator('list_policies')
-            for page in paginator.paginate(Scope='Local'):  # Only customer policies
+            now = datetime.now()  # CreateDate fallback, read once per ingest
+            for page in paginator.paginate(Scope='Local', PaginationConfig={'PageSize': IAM_PAGE_SIZE}):  # Only customer policies
+                nodes = []
                 for policy in page['Policies']:
-                    node = IdentityNode(
+                    nodes.append(IdentityNode(
                         id=f"policy:{policy['PolicyName']}",
                         node_type=NodeType.POLICY,
                         name=policy['PolicyName'],
                         arn=policy['Arn'],
-                        created_at=policy.get('CreateDate', datetime.now()),
+                        created_at=policy.get('CreateDate', now),
                         privilege_level=self._calculate_policy_privilege(policy['Arn']),
                         metadata={
                             "policy_id": policy['PolicyId'],
                             "attachment_count": policy.get('AttachmentCount', 0)
                         }
-                    )
-                    identity_graph.add_node(node)
-                    count += 1
+                    ))
+                identity_graph.add_nodes_bulk(nodes)
+                count += len(nodes)
                     
         except ClientError as e:
-            logger.error(f"Error ingesting policies: {e}")
+            logger.warning("Error ingesting policies: %s", e)
         
         return count
     
     def ingest_groups(self) -> int:
-        """Ingest IAM groups and group memberships"""
+        """Ingest IAM groups and group memberships (edges are applied by ingest_all)"""
         count = 0
         try:
             paginator = self.iam.get_paginator('list_groups')
-            for page in paginator.paginate():
-                for group in page['Groups']:
-                    node = IdentityNode(
-                        id=f"group:{group['GroupName']}",
-                        node_type=NodeType.IAM_GROUP,
-                        name=group['GroupName'],
-                        arn=group['Arn'],
-                        created_at=group.get('CreateDate', datetime.now()),
-                        metadata={
-                            "group_id": group['GroupId'],
-                            "path": group.get('Path', '/')
-                        }
-                    )
-                    identity_graph.add_node(node)
-                    count += 1
-                    
-                    # Add group members
-                    self._ingest_group_members(group['GroupName'])
+            now = datetime.now()  # CreateDate fallback, read once per ingest
+            for page in paginator.paginate(PaginationConfig={'PageSize': IAM_PAGE_SIZE}):
+                nodes = []
+                for node, batch in self._executor.map(self._fetch_group, page['Groups'], itertools.repeat(now)):
+                    nodes.append(node)
+                    self._queue_batch(batch)
+                identity_graph.add_nodes_bulk(nodes)
+                count += len(nodes)
                     
         except ClientError as e:
-            logger.error(f"Error ingesting groups: {e}")
+            logger.warning("Error ingesting groups: %s", e)
         
         return count
+
+    def _fetch_group(self, group: dict, now: datetime) -> tuple[IdentityNode, _IngestBatch]:
+        node = IdentityNode(
+            id=f"group:{group['GroupName']}",
+            node_type=NodeType.IAM_GROUP,
+            name=group['GroupName'],
+            arn=group['Arn'],
+            created_at=group.get('CreateDate', now),
+            metadata={
+                "group_id": group['GroupId'],
+                "path": group.get('Path', '/')
+            }
+        )
+        batch = _IngestBatch()
+        # Add group members
+        self._ingest_group_members(group['GroupName'], batch)
+        return node, batch
+
+    def _queue_batch(self, batch: _IngestBatch) -> None:
+        with self._pending_lock:
+            self._pending.edges.extend(batch.edges)
+            self._pending.ec2_escalators.extend(batch.ec2_escalators)
+
+    def _apply_pending_edges(self) -> None:
+        """Add queued edges now that every node from this ingest exists"""
+        pending, self._pending = self._pending, _IngestBatch()
+        edges = pending.edges
+        # PassRole + RunInstances reaches any role EC2 can assume
+        for entity_id in pending.ec2_escalators:
+            edges.extend((entity_id, role_id, EdgeType.CAN_ASSUME) for role_id in self._ec2_candidate_roles)
+        identity_graph.add_edges_bulk(edges)
     
-    def _ingest_user_policies(self, username: str) -> None:
-        """Add edges from user to attached policies"""
+    def _ingest_user_policies(self, username: str, batch: _IngestBatch) -> list[dict]:
+        """Add edges from user to attached policies; returns the policies listed"""
+        attached_policies = []
         try:
             # Attached managed policies
             attached = self.iam.list_attached_user_policies(UserName=username)
-            for policy in attached.get('AttachedPolicies', []):
+            attached_policies = attached.get('AttachedPolicies', [])
+            for policy in attached_policies:
                 policy_id = f"policy:{policy['PolicyName']}"
                 user_id = f"user:{username}"
-                identity_graph.add_edge(user_id, policy_id, EdgeType.HAS_POLICY)
+                batch.add_edge(user_id, policy_id, EdgeType.HAS_POLICY)
                 
                 # Parse policy for additional edges (AssumeRole, PassRole)
-                self._parse_and_ingest_policy_permissions(user_id, policy['PolicyArn'])
+                self._parse_and_ingest_policy_permissions(user_id, policy['PolicyArn'], batch)
         except ClientError:
             pass
+        return attached_policies
     
-    def _ingest_role_policies(self, role_name: str) -> None:
-        """Add edges from role to attached policies"""
+    def _ingest_role_policies(self, role_name: str, batch: _IngestBatch) -> list[dict]:
+        """Add edges from role to attached policies; returns the policies listed"""
+        attached_policies = []
         try:
             attached = self.iam.list_attached_role_policies(RoleName=role_name)
-            for policy in attached.get('AttachedPolicies', []):
+            attached_policies = attached.get('AttachedPolicies', [])
+            for policy in attached_policies:
                 policy_id = f"policy:{policy['PolicyName']}"
                 role_id = f"role:{role_name}"
-                identity_graph.add_edge(role_id, policy_id, EdgeType.HAS_POLICY)
+                batch.add_edge(role_id, policy_id, EdgeType.HAS_POLICY)
                 
                 # Parse policy for additional edges
-                self._parse_and_ingest_policy_permissions(role_id, policy['PolicyArn'])
+                self._parse_and_ingest_policy_permissions(role_id, policy['PolicyArn'], batch)
         except ClientError:
             pass
+        return attached_policies
     
-    def _ingest_role_trust(self, role: dict) -> None:
+    def _ingest_role_trust(self, role: dict, batch: _IngestBatch) -> None:
         """Parse trust policy to find who can assume this role"""
         trust_policy = role.get('AssumeRolePolicyDocument', {})
         statements = trust_policy.get('Statement', [])
@@ -247,16 +379,12 @@ class AWSIngester:
             
             role_id = f"role:{role['RoleName']}"
             for principal in aws_principals:
-                if ':user/' in principal:
-                    user_name = principal.split('/')[-1]
-                    user_id = f"user:{user_name}"
-                    identity_graph.add_edge(user_id, role_id, EdgeType.CAN_ASSUME)
-                elif ':role/' in principal:
-                    source_role = principal.split('/')[-1]
-                    source_id = f"role:{source_role}"
-                    identity_graph.add_edge(source_id, role_id, EdgeType.CAN_ASSUME)
+                match = _PRINCIPAL_RE.search(principal)
+                if match:
+                    source_id = f"{match['kind']}:{match['name']}"
+                    batch.add_edge(source_id, role_id, EdgeType.CAN_ASSUME)
     
-    def _ingest_group_members(self, group_name: str) -> None:
+    def _ingest_group_members(self, group_name: str, batch: _IngestBatch) -> None:
         """Add edges from users to their groups"""
         try:
             response = self.iam.get_group(GroupName=group_name)
@@ -264,89 +392,174 @@ class AWSIngester:
             
             # Group's policies affect all members
             attached = self.iam.list_attached_group_policies(GroupName=group_name)
+            group_policy_edges = []
             for policy in attached.get('AttachedPolicies', []):
-                identity_graph.add_edge(group_id, f"policy:{policy['PolicyName']}", EdgeType.HAS_POLICY)
+                batch.add_edge(group_id, f"policy:{policy['PolicyName']}", EdgeType.HAS_POLICY)
+                edges = self._policy_edges_for(policy['PolicyArn'])
+                # Policies granting no escalation edges add nothing per member
+                if edges is not None and (edges.assumable_role_ids or edges.ec2_escalation):
+                    group_policy_edges.append(edges)
             
             for user in response.get('Users', []):
                 user_id = f"user:{user['UserName']}"
-                identity_graph.add_edge(user_id, group_id, EdgeType.MEMBER_OF)
+                batch.add_edge(user_id, group_id, EdgeType.MEMBER_OF)
                 
                 # Users inherit group permissions
-                for policy in attached.get('AttachedPolicies', []):
-                    self._parse_and_ingest_policy_permissions(user_id, policy['PolicyArn'])
+                for edges in group_policy_edges:
+                    self._apply_policy_edges(user_id, edges, batch)
                     
         except ClientError:
             pass
 
-    def _parse_and_ingest_policy_permissions(self, entity_id: str, policy_arn: str) -> None:
+    def _parse_and_ingest_policy_permissions(self, entity_id: str, policy_arn: str, batch: _IngestBatch) -> None:
         """Parse policy JSON to find logical escalation edges"""
+        edges = self._policy_edges_for(policy_arn)
+        if edges is not None:
+            self._apply_policy_edges(entity_id, edges, batch)
+
+    def _policy_edges_for(self, policy_arn: str) -> Optional[PolicyEdges]:
+        """Escalation edges of a policy whose permissions should become edges"""
         if USE_MOCK_DATA:
-            return
+            return None
 
-        # Check cache first
-        if policy_arn in self._policy_cache:
-            self._apply_policy_edges(entity_id, self._policy_cache[policy_arn])
-            return
+        # Skip AWS service-linked policies
+        if ":policy/aws-service-role/" in policy_arn:
+            return None
+
+        return self._load_policy_edges(policy_arn)
+
+    def _load_policy_edges(self, policy_arn: str) -> Optional[PolicyEdges]:
+        """Return a policy's parsed escalation edges, fetching each ARN at most once.
+
+        Entities that share a managed policy are ingested concurrently, so the
+        first caller for an ARN fetches it and the rest wait on its Future.
+        """
+        edges = self._policy_cache.get(policy_arn)
+        if edges is not None:
+            return edges
+
+        with self._policy_lock:
+            edges = self._policy_cache.get(policy_arn)
+            if edges is not None:
+                return edges
+            future = self._policy_fetches.get(policy_arn)
+            owner = future is None
+            if owner:
+                future = self._policy_fetches[policy_arn] = Future()
+
+        if not owner:
+            return future.result()
 
         try:
-            # Skip AWS service-linked policies
-            if ":policy/aws-service-role/" in policy_arn:
-                return
-            
-            logger.debug(f"Parsing policy {policy_arn} for {entity_id}")
+            document = self._fetch_policy_document(policy_arn)
+            edges = None if document is None else self._policy_edges(document)
+            if edges is not None:
+                self._policy_cache[policy_arn] = edges
+            future.set_result(edges)
+            return edges
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            # Failures are not cached, so a later ingest retries them
+            with self._policy_lock:
+                self._policy_fetches.pop(policy_arn, None)
+
+    def _fetch_policy_document(self, policy_arn: str) -> Optional[dict]:
+        # Throttling is retried by the client's adaptive retry mode, so a
+        # ClientError here means the retries were exhausted or it is permanent
+        try:
+            return self._fetch_default_policy_version(policy_arn)
+        except ClientError as e:
+            logger.error("Error parsing policy %s: %s", policy_arn, e)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Error parsing policy %s: %s", policy_arn, e)
+        return None
+
+    def _load_default_version_ids(self) -> None:
+        """List every attached policy's default version in a few paginated calls"""
+        self._default_version_ids = {}
+        try:
+            paginator = self.iam.get_paginator('list_policies')
+            pages = paginator.paginate(Scope='All', OnlyAttached=True, PaginationConfig={'PageSize': IAM_PAGE_SIZE})
+            for page in pages:
+                for policy in page['Policies']:
+                    self._default_version_ids[policy['Arn']] = policy['DefaultVersionId']
+        except ClientError as e:
+            # Not fatal: each document fetch falls back to get_policy
+            logger.warning("Error listing policy versions: %s", e)
+
+    def _fetch_default_policy_version(self, policy_arn: str) -> Optional[dict]:
+        logger.debug("Fetching policy %s", policy_arn)
+        listed_version_id = self._default_version_ids.get(policy_arn)
+        if listed_version_id is not None:
+            version_id = listed_version_id
+        else:
             policy = self.iam.get_policy(PolicyArn=policy_arn)
             version_id = policy['Policy']['DefaultVersionId']
-            version = self.iam.get_policy_version(PolicyArn=policy_arn, VersionId=version_id)
-            document = version['PolicyVersion']['Document']
-            
-            # Handle document as string or dict
-            if isinstance(document, str):
-                import urllib.parse
-                try:
-                    # Sometimes it's URL encoded
-                    if '%' in document:
-                        document = json.loads(urllib.parse.unquote(document))
-                    else:
-                        document = json.loads(document)
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse policy JSON: {policy_arn}")
-                    return
-
-            if not isinstance(document, dict):
-                return
-
-            # Store in cache
-            self._policy_cache[policy_arn] = document
-            
-            # Apply edges
-            self._apply_policy_edges(entity_id, document)
 
+        # A stored document for the same default version is still current
+        stored = self._stored_policies.get(policy_arn)
+        if stored is not None and stored["version_id"] == version_id:
+            return stored["document"]
+
+        try:
+            version = self.iam.get_policy_version(PolicyArn=policy_arn, VersionId=version_id)
         except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "")
-            if error_code in {"Throttling", "RequestLimitExceeded", "ServiceUnavailable"}:
-                for attempt in range(1, 4):
-                    time.sleep(0.3 * attempt)
-                    try:
-                        policy = self.iam.get_policy(PolicyArn=policy_arn)
-                        version_id = policy["Policy"]["DefaultVersionId"]
-                        version = self.iam.get_policy_version(PolicyArn=policy_arn, VersionId=version_id)
-                        document = version["PolicyVersion"]["Document"]
-                        if isinstance(document, dict):
-                            self._policy_cache[policy_arn] = document
-                            self._apply_policy_edges(entity_id, document)
-                            return
-                    except ClientError:
-                        continue
-            logger.error(f"Error parsing policy {policy_arn}: {e}")
-        except (KeyError, TypeError, ValueError) as e:
-            logger.error(f"Error parsing policy {policy_arn}: {e}")
+            if listed_version_id is None or e.response.get('Error', {}).get('Code') != 'NoSuchEntity':
+                raise
+            # The default changed since it was listed; ask for the current one
+            self._default_version_ids.pop(policy_arn, None)
+            return self._fetch_default_policy_version(policy_arn)
+        document = version['PolicyVersion']['Document']
+        
+        # Handle document as string or dict
+        if isinstance(document, str):
+            try:
+                # Sometimes it's URL encoded
+                if '%' in document:
+                    document = urllib.parse.unquote(document)
+                document = orjson.loads(document)
+            except orjson.JSONDecodeError:
+                logger.warning("Failed to parse policy JSON: %s", policy_arn)
+                return None
+
+        if not isinstance(document, dict):
+            return None
+
+        self._stored_policies[policy_arn] = {"version_id": version_id, "document": document}
+        self._stored_policies_dirty = True
+        return document
+
+    def _save_stored_policies(self) -> None:
+        if not self._stored_policies_dirty:
+            return
+        tmp_path = POLICY_CACHE_FILE.with_suffix(".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(orjson.dumps(self._stored_policies))
+        os.replace(tmp_path, POLICY_CACHE_FILE)
+        self._stored_policies_dirty = False
+
+    def _load_stored_policies(self) -> dict:
+        if not POLICY_CACHE_FILE.exists():
+            return {}
 
-    def _apply_policy_edges(self, entity_id: str, document: dict) -> None:
-        """Apply edges from a successfully parsed policy document"""
+        try:
+            with open(POLICY_CACHE_FILE, "rb") as file:
+                data = orjson.loads(file.read())
+        except (orjson.JSONDecodeError, OSError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _policy_edges(document: dict) -> PolicyEdges:
+        """Reduce a policy document to the escalation edges it grants"""
         statements = document.get('Statement', [])
         if isinstance(statements, dict):
             statements = [statements]
         
+        assumable_role_ids: dict[str, None] = {}
+        ec2_escalation = False
         for stmt in statements:
             if stmt.get('Effect') != 'Allow':
                 continue
@@ -354,63 +567,77 @@ class AWSIngester:
             actions = stmt.get('Action', [])
             if isinstance(actions, str):
                 actions = [actions]
-            # Normalize to lowercase for robust matching
-            actions = [a.lower() for a in actions]
+            # Most statements grant nothing escalation-relevant; skip them
+            # before building the normalized action set
+            if not any('*' in a or a.lower() in _ESCALATION_ACTIONS for a in actions):
+                continue
+            # Normalize to lowercase for robust matching; set intersections
+            # below replace per-candidate scans of the action list
+            actions = {a.lower() for a in actions}
             
             resources = stmt.get('Resource', [])
             if isinstance(resources, str):
                 resources = [resources]
             
             # Detect AssumeRole (case-insensitive checks)
-            if any(a in actions for a in ['sts:assumerole', 'sts:*', '*']):
+            if not actions.isdisjoint(ASSUME_ROLE_ACTIONS):
                 for res in resources:
                     if ':role/' in res:
-                        role_name = res.split('/')[-1].replace('*', '')
+                        role_name = res.rpartition('/')[2].replace('*', '')
                         if role_name:
-                            target_id = f"role:{role_name}"
-                            logger.debug(f"Adding CAN_ASSUME edge: {entity_id} -> {target_id}")
-                            identity_graph.add_edge(entity_id, target_id, EdgeType.CAN_ASSUME)
+                            assumable_role_ids[f"role:{role_name}"] = None
 
             # Detect PassRole + RunInstances (EC2 Escalation)
-            has_passrole = any(a in actions for a in ['iam:passrole', 'iam:*', '*'])
-            has_runinstances = any(a in actions for a in ['ec2:runinstances', 'ec2:*', '*'])
-            
-            if has_passrole and has_runinstances:
-                logger.info(f"Detected PassRole+RunInstances escalation capability for {entity_id}")
-                self._link_to_ec2_assumable_roles(entity_id)
-
-    def _link_to_ec2_assumable_roles(self, entity_id: str) -> None:
-        """Find roles that EC2 can assume and link to them (representing PassRole escalation)"""
-        # Optimize: reuse current graph state instead of calling to_dict every time
-        for n_id in identity_graph.graph.nodes:
-            node_data = identity_graph.graph.nodes[n_id]
-            if node_data.get('node_type') == NodeType.IAM_ROLE.value:
-                role_name = node_data.get('name', '')
-                if 'EC2' in role_name or 'Admin' in role_name:
-                    identity_graph.add_edge(entity_id, n_id, EdgeType.CAN_ASSUME)
+            if not actions.isdisjoint(PASS_ROLE_ACTIONS) and not actions.isdisjoint(RUN_INSTANCES_ACTIONS):
+                ec2_escalation = True
+
+        return PolicyEdges(assumable_role_ids=tuple(assumable_role_ids), ec2_escalation=ec2_escalation)
+
+    def _apply_policy_edges(self, entity_id: str, edges: PolicyEdges, batch: _IngestBatch) -> None:
+        """Apply the escalation edges a policy grants to one entity"""
+        for target_id in edges.assumable_role_ids:
+            logger.debug("Adding CAN_ASSUME edge: %s -> %s", entity_id, target_id)
+            batch.add_edge(entity_id, target_id, EdgeType.CAN_ASSUME)
+
+        if edges.ec2_escalation:
+            logger.info("Detected PassRole+RunInstances escalation capability for %s", entity_id)
+            # Linked once all roles are known; see _apply_pending_edges
+            batch.ec2_escalators.append(entity_id)
+
+    def _add_role_nodes(self, nodes: list[IdentityNode]) -> None:
+        identity_graph.add_nodes_bulk(nodes)
+        for node in nodes:
+            if 'EC2' in node.name or 'Admin' in node.name:
+                self._ec2_candidate_roles[node.id] = None
     
     def _calculate_user_privilege(self, username: str) -> int:
         """Calculate privilege level for a user (0-100)"""
         if USE_MOCK_DATA:
             return 10  # Default mock level
             
-        # Start with base level
-        privilege = 10
-        
         try:
-            # Check for admin policies
             attached = self.iam.list_attached_user_policies(UserName=username)
-            for policy in attached.get('AttachedPolicies', []):
-                if 'Admin' in policy['PolicyName'] or 'FullAccess' in policy['PolicyName']:
-                    privilege = max(privilege, 90)
-                elif 'PowerUser' in policy['PolicyName']:
-                    privilege = max(privilege, 70)
-                elif 'ReadOnly' in policy['PolicyName']:
-                    privilege = max(privilege, 20)
-                else:
-                    privilege = max(privilege, 40)
         except ClientError:
-            pass
+            attached = {}
+        return self._user_privilege_from_attached(attached.get('AttachedPolicies', []))
+
+    @staticmethod
+    def _user_privilege_from_attached(attached_policies: list[dict]) -> int:
+        """Privilege level for a user from its already-listed attached policies"""
+        # Start with base level
+        privilege = 10
+        
+        # Check for admin policies
+        for policy in attached_policies:
+            if 'Admin' in policy['PolicyName'] or 'FullAccess' in policy['PolicyName']:
+                privilege = 90
+                break  # The highest level a user's policies can set
+            elif 'PowerUser' in policy['PolicyName']:
+                privilege = max(privilege, 70)
+            elif 'ReadOnly' in policy['PolicyName']:
+                privilege = max(privilege, 20)
+            else:
+                privilege = max(privilege, 40)
         
         return privilege
     
@@ -419,96 +646,127 @@ class AWSIngester:
         if USE_MOCK_DATA:
             return 20  # Default mock level
             
+        try:
+            attached = self.iam.list_attached_role_policies(RoleName=role_name)
+        except ClientError:
+            attached = {}
+        return self._role_privilege_from_attached(role_name, attached.get('AttachedPolicies', []))
+
+    @staticmethod
+    def _role_privilege_from_attached(role_name: str, attached_policies: list[dict]) -> int:
+        """Privilege level for a role from its name and already-listed attached policies"""
         privilege = 20
         
         # Check role name keywords
-        role_lower = role_name.lower()
-        if 'admin' in role_lower or 'root' in role_lower or 'super' in role_lower:
-            privilege = max(privilege, 95)
-        elif 'power' in role_lower or 'engineer' in role_lower or 'production' in role_lower or 'maintenance' in role_lower:
-            privilege = max(privilege, 75)
-        elif 'billing' in role_lower or 'security' in role_lower or 'auditor' in role_lower:
-            privilege = max(privilege, 65)
-        elif 'readonly' in role_lower or 'viewer' in role_lower:
-            privilege = max(privilege, 25)
-        elif 'ec2' in role_lower:
-            privilege = max(privilege, 50)
+        tier = min(map(_ROLE_KEYWORD_TIER.__getitem__, _ROLE_KEYWORD_RE.findall(role_name.lower())), default=None)
+        if tier is not None:
+            privilege = max(privilege, _ROLE_NAME_TIERS[tier][1])
         
         # Check attached policies for high privilege
-        try:
-            attached = self.iam.list_attached_role_policies(RoleName=role_name)
-            for policy in attached.get('AttachedPolicies', []):
-                policy_name = policy['PolicyName']
-                if 'AdministratorAccess' in policy_name:
-                    privilege = 100
-                elif 'PowerUserAccess' in policy_name:
-                    privilege = max(privilege, 85)
-                elif 'FullAccess' in policy_name:
-                    privilege = max(privilege, 75)
-                elif 'IAMFullAccess' in policy_name or 'IAMManagement' in policy_name:
-                    privilege = max(privilege, 90)
-        except ClientError:
-            pass
+        for policy in attached_policies:
+            policy_name = policy['PolicyName']
+            if 'AdministratorAccess' in policy_name:
+                privilege = 100
+                break  # Nothing ranks higher
+            elif 'PowerUserAccess' in policy_name:
+                privilege = max(privilege, 85)
+            elif 'FullAccess' in policy_name:
+                privilege = max(privilege, 75)
+            elif 'IAMFullAccess' in policy_name or 'IAMManagement' in policy_name:
+                privilege = max(privilege, 90)
         
         return privilege
     
     def _calculate_policy_privilege(self, policy_arn: str) -> int:
         """Calculate privilege level for a policy (0-100)"""
-        if 'AdministratorAccess' in policy_arn:
-            return 100
-        elif 'PowerUserAccess' in policy_arn:
-            return 80
-        elif 'ReadOnlyAccess' in policy_arn:
-            return 20
-        elif 'FullAccess' in policy_arn:
-            return 70
-        return 40
+        return _policy_privilege_by_arn(policy_arn)
     
-    def get_recent_events(self, hours: int = 24) -> list[dict]:
-        """Get recent CloudTrail events for IAM actions"""
-        events = []
+    def get_recent_events(self, hours: int = 24) -> Iterator[CloudTrailEvent]:
+        """Yield recent CloudTrail events for IAM actions, page by page"""
         try:
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(hours=hours)
             
-            response = self.cloudtrail.lookup_events(
+            paginator = self.cloudtrail.get_paginator('lookup_events')
+            pages = paginator.paginate(
                 LookupAttributes=[
                     {'AttributeKey': 'EventSource', 'AttributeValue': 'iam.amazonaws.com'}
                 ],
                 StartTime=start_time,
                 EndTime=end_time,
-                MaxResults=50
+                PaginationConfig={'PageSize': 50}
             )
             
-            for event in response.get('Events', []):
-                events.append({
-                    "event_id": event.get('EventId'),
-                    "event_name": event.get('EventName'),
-                    "event_time": event.get('EventTime').isoformat() if event.get('EventTime') else None,
-                    "username": event.get('Username'),
-                    "resources": event.get('Resources', [])
-                })
-                metrics.record_event_processed()
+            for page in pages:
+                for event in page.get('Events', []):
+                    event_time = event.get('EventTime')
+                    if event_time is None:
+                        logger.debug("CloudTrail event %s has no EventTime", event.get('EventId'))
+                    metrics.record_event_processed()
+                    yield CloudTrailEvent(
+                        event_id=event.get('EventId'),
+                        event_name=event.get('EventName'),
+                        event_time=event_time.isoformat() if event_time else None,
+                        username=event.get('Username'),
+                        resources=event.get('Resources', [])
+                    )
                 
         except ClientError as e:
-            logger.error(f"Error fetching CloudTrail events: {e}")
-        
-        return events
+            logger.error("Error fetching CloudTrail events: %s", e)
+
+    def get_recent_events_list(self, hours: int = 24) -> list[CloudTrailEvent]:
+        """Collect get_recent_events into a list for callers that need one"""
+        return list(self.get_recent_events(hours))
     
-    def ingest_all(self) -> dict:
-        """Full ingestion of all IAM entities"""
+    def ingest_all(self, force_refresh: bool = False) -> dict:
+        """Full ingestion of all IAM entities, reused for INGEST_CACHE_TTL_SECONDS"""
+        with self._ingest_lock:
+            fresh = (
+                self._last_ingest_result is not None
+                and time.monotonic() - self._last_ingest_at < INGEST_CACHE_TTL_SECONDS
+            )
+            metrics.record_ingest_cache(hit=fresh and not force_refresh)
+            if fresh and not force_refresh:
+                # Counts reflect the graph now, including changes since the ingest
+                return {
+                    **self._last_ingest_result,
+                    "total_nodes": identity_graph.node_count,
+                    "total_edges": identity_graph.edge_count,
+                }
+
+            results = self._ingest_all()
+            self._last_ingest_result = results
+            self._last_ingest_at = time.monotonic()
+            return dict(results)
+
+    def _ingest_all(self) -> dict:
+        self._trust_policies.clear()
         # Check for simulation mode
         if USE_MOCK_DATA:
             return self.ingest_mock_data()
 
-        results = {
-            "users": self.ingest_users(),
-            "roles": self.ingest_roles(),
-            "groups": self.ingest_groups(),
-            "policies": self.ingest_policies(),
-            "total_nodes": identity_graph.node_count,
-            "total_edges": identity_graph.edge_count
+        # Parsed edges are only reused within one ingest: a policy's default
+        # version can change between ingests, and the stored documents (keyed
+        # by version) already spare unchanged policies a re-fetch
+        self._policy_cache.clear()
+        # Also creates the IAM client here, before the phase threads share it
+        self._load_default_version_ids()
+        phases = {
+            "users": self.ingest_users,
+            "roles": self.ingest_roles,
+            "groups": self.ingest_groups,
+            "policies": self.ingest_policies,
         }
+        # The list phases are independent: nodes go into the graph under its
+        # write lock and edges wait in _pending until every phase is done.
+        # A separate pool, since the phases themselves fan out on _executor.
+        with ThreadPoolExecutor(max_workers=INGEST_PHASES, thread_name_prefix="iam-phase") as pool:
+            futures = {name: pool.submit(phase) for name, phase in phases.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        self._apply_pending_edges()
+        self._save_stored_policies()
+        results["total_nodes"] = identity_graph.node_count
+        results["total_edges"] = identity_graph.edge_count
         return results
 
     def ingest_mock_data(self) -> dict:
@@ -542,111 +800,119 @@ class AWSIngester:
         return results
 
     def _ingest_mock_users(self, users: list) -> int:
-        """Ingest mock users into graph"""
-        count = 0
+        """Ingest mock users into graph (the generator supplies every privilege level)"""
+        nodes = []
+        now = datetime.now()
         for user in users:
-            node = IdentityNode(
-                id=f"user:{user['UserName']}",
+            username = user['UserName']
+            nodes.append(IdentityNode(
+                id=f"user:{username}",
                 node_type=NodeType.IAM_USER,
-                name=user['UserName'],
+                name=username,
                 arn=user['Arn'],
-                created_at=user.get('CreateDate', datetime.now()),
-                privilege_level=self._calculate_user_privilege(user['UserName']),
+                created_at=user.get('CreateDate', now),
+                privilege_level=user['privilege_level'],
                 metadata={
                     "user_id": user['UserId'],
                     "path": user.get('Path', '/'),
                     "department": user.get('department', 'unknown')
                 }
-            )
-            identity_graph.add_node(node)
-            count += 1
-        return count
+            ))
+        identity_graph.add_nodes_bulk(nodes)
+        return len(nodes)
 
     def _ingest_mock_roles(self, roles: list) -> int:
         """Ingest mock roles into graph"""
-        count = 0
+        nodes = []
+        edges = []
+        now = datetime.now()
+        # Users who may assume the first few roles
+        assuming_user_ids = tuple(f"user:employee_{i:03d}" for i in range(1, 4))
         for role in roles:
-            node = IdentityNode(
-                id=f"role:{role['RoleName']}",
+            role_name = role['RoleName']
+            role_id = f"role:{role_name}"
+            nodes.append(IdentityNode(
+                id=role_id,
                 node_type=NodeType.IAM_ROLE,
-                name=role['RoleName'],
+                name=role_name,
                 arn=role['Arn'],
-                created_at=role.get('CreateDate', datetime.now()),
-                privilege_level=role.get('privilege_level', self._calculate_role_privilege(role['RoleName'])),
+                created_at=role.get('CreateDate', now),
+                privilege_level=role['privilege_level'],
                 metadata={
                     "role_id": role['RoleId'],
                     "path": role.get('Path', '/'),
-                    "assume_role_policy": role.get('AssumeRolePolicyDocument', {})
+                    "assume_role_policy": self._shared_trust_policy(role.get('AssumeRolePolicyDocument', {}))
                 }
-            )
-            identity_graph.add_node(node)
-            count += 1
+            ))
+            count = len(nodes)
 
-            # Add some mock assume role relationships
+            # Add some mock assume role relationships (edges to missing users are skipped)
             if count <= 5:  # First few roles can be assumed by users
-                for i in range(1, min(4, count + 1)):
-                    user_id = f"user:employee_{i:03d}"
-                    if identity_graph.get_node(user_id):
-                        identity_graph.add_edge(user_id, f"role:{role['RoleName']}", EdgeType.CAN_ASSUME)
+                for user_id in assuming_user_ids[:count]:
+                    edges.append((user_id, role_id, EdgeType.CAN_ASSUME))
 
-        return count
+        self._add_role_nodes(nodes)
+        identity_graph.add_edges_bulk(edges)
+        return len(nodes)
 
     def _ingest_mock_groups(self, groups: list, memberships: dict) -> int:
         """Ingest mock groups and memberships into graph"""
-        count = 0
+        nodes = []
+        edges = []
+        now = datetime.now()
         for group in groups:
-            node = IdentityNode(
-                id=f"group:{group['GroupName']}",
+            group_name = group['GroupName']
+            group_id = f"group:{group_name}"
+            nodes.append(IdentityNode(
+                id=group_id,
                 node_type=NodeType.IAM_GROUP,
-                name=group['GroupName'],
+                name=group_name,
                 arn=group['Arn'],
-                created_at=group.get('CreateDate', datetime.now()),
+                created_at=group.get('CreateDate', now),
                 metadata={
                     "group_id": group['GroupId'],
                     "path": group.get('Path', '/'),
                     "attached_policy": group.get('attached_policy', '')
                 }
-            )
-            identity_graph.add_node(node)
-            count += 1
+            ))
 
-            # Add group memberships
-            group_members = memberships.get(group['GroupName'], [])
+            # Add group memberships (edges to missing users are skipped)
+            group_members = memberships.get(group_name, [])
             for username in group_members:
-                user_id = f"user:{username}"
-                group_id = f"group:{group['GroupName']}"
-                if identity_graph.get_node(user_id):
-                    identity_graph.add_edge(user_id, group_id, EdgeType.MEMBER_OF)
+                edges.append((f"user:{username}", group_id, EdgeType.MEMBER_OF))
 
-        return count
+        identity_graph.add_nodes_bulk(nodes)
+        identity_graph.add_edges_bulk(edges)
+        return len(nodes)
 
     def _ingest_mock_policies(self, policies: list, attachments: dict) -> int:
         """Ingest mock policies and attachments into graph"""
-        count = 0
+        nodes = []
+        now = datetime.now()
         for policy in policies:
-            node = IdentityNode(
-                id=f"policy:{policy['PolicyName']}",
+            policy_name = policy['PolicyName']
+            nodes.append(IdentityNode(
+                id=f"policy:{policy_name}",
                 node_type=NodeType.POLICY,
-                name=policy['PolicyName'],
+                name=policy_name,
                 arn=policy['Arn'],
-                created_at=policy.get('CreateDate', datetime.now()),
-                privilege_level=policy.get('privilege_level', self._calculate_policy_privilege(policy['Arn'])),
+                created_at=policy.get('CreateDate', now),
+                privilege_level=policy['privilege_level'],
                 metadata={
                     "policy_id": policy['PolicyId'],
                     "attachment_count": policy.get('AttachmentCount', 0)
                 }
-            )
-            identity_graph.add_node(node)
-            count += 1
+            ))
+        identity_graph.add_nodes_bulk(nodes)
 
-        # Add policy attachments
-        for entity_id, attached_policies in attachments.items():
-            for policy in attached_policies:
-                policy_id = f"policy:{policy['PolicyName']}"
-                if identity_graph.get_node(entity_id) and identity_graph.get_node(policy_id):
-                    identity_graph.add_edge(entity_id, policy_id, EdgeType.HAS_POLICY)
+        # Add policy attachments (edges between missing nodes are skipped)
+        identity_graph.add_edges_bulk(
+            (entity_id, f"policy:{policy['PolicyName']}", EdgeType.HAS_POLICY)
+            for entity_id, attached_policies in attachments.items()
+            for policy in attached_policies
+        )
 
-        return count
+        return len(nodes)
 
     def get_mock_events(self, hours: int = 24) -> list[dict]:
         """Get mock CloudTrail events (no AWS API calls)"""
@@ -2,9 +2,20 @@
 Project Athena - AWS Remediation Module
 Handles active response actions against AWS APIs
 """
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+import orjson
+import re
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
+
+from core.aws_session import get_client
+
+# Concurrent IAM calls when remediating many users or keys at once
+REMEDIATION_CONCURRENCY = 10
+
+# Target ARN -> ("user" | "role" | "group", name); the name drops any path
+_TARGET_ARN_RE = re.compile(r":(?P<kind>user|role|group)/(?:.*/)?(?P<name>[^/]*)$")
 
 class AWSRemediator:
     """
@@ -14,38 +25,33 @@ class AWSRemediator:
     def __init__(self, region: str = "us-east-1"):
         self.region = region
         self._iam_client = None
+        self._executor = ThreadPoolExecutor(max_workers=REMEDIATION_CONCURRENCY, thread_name_prefix="iam-remediate")
     
     @property
     def iam(self):
         """Lazy-load IAM client"""
         if self._iam_client is None:
-            try:
-                self._iam_client = boto3.client('iam', region_name=self.region)
-            except NoCredentialsError:
-                raise RuntimeError("AWS credentials not configured")
+            # Shares the ingester's session and retry policy, but remediation
+            # always targets the default AWS endpoint, never AWS_ENDPOINT_URL
+            self._iam_client = get_client('iam', self.region, endpoint_url=None)
         return self._iam_client
 
     def detach_policy(self, target_arn: str, policy_arn: str) -> dict:
         """Detach a managed policy from a user, group, or role"""
+        # Determine target type from ARN
+        match = _TARGET_ARN_RE.search(target_arn)
+        if match is None:
+            return {"status": "error", "message": "Unknown target type"}
+        kind, name = match['kind'], match['name']
+
         try:
-            # Determine target type from ARN
-            if ':user/' in target_arn:
-                username = target_arn.split('/')[-1]
-                self.iam.detach_user_policy(UserName=username, PolicyArn=policy_arn)
-                return {"status": "success", "message": f"Detached {policy_arn} from user {username}"}
-            
-            elif ':role/' in target_arn:
-                role_name = target_arn.split('/')[-1]
-                self.iam.detach_role_policy(RoleName=role_name, PolicyArn=policy_arn)
-                return {"status": "success", "message": f"Detached {policy_arn} from role {role_name}"}
-                
-            elif ':group/' in target_arn:
-                group_name = target_arn.split('/')[-1]
-                self.iam.detach_group_policy(GroupName=group_name, PolicyArn=policy_arn)
-                return {"status": "success", "message": f"Detached {policy_arn} from group {group_name}"}
-            
+            if kind == 'user':
+                self.iam.detach_user_policy(UserName=name, PolicyArn=policy_arn)
+            elif kind == 'role':
+                self.iam.detach_role_policy(RoleName=name, PolicyArn=policy_arn)
             else:
-                return {"status": "error", "message": "Unknown target type"}
+                self.iam.detach_group_policy(GroupName=name, PolicyArn=policy_arn)
+            return {"status": "success", "message": f"Detached {policy_arn} from {kind} {name}"}
                 
         except ClientError as e:
             return {"status": "error", "message": str(e)}
@@ -63,24 +69,48 @@ class AWSRemediator:
 
     def disable_access_keys(self, username: str) -> dict:
         """Disable all active access keys for a user"""
-        results = []
+        return self.disable_access_keys_bulk([username])[username]
+
+    def disable_access_keys_bulk(self, usernames: list[str]) -> dict[str, dict]:
+        """Disable all active access keys for each user; results keyed by username"""
+        usernames = list(dict.fromkeys(usernames))
+        results = {}
+        self.iam  # Create the client here, before the worker threads share it
+        # List every user's keys concurrently, then deactivate every key concurrently
+        updates = []
+        for username, listing in zip(usernames, self._executor.map(self._list_active_keys, usernames)):
+            if isinstance(listing, ClientError):
+                results[username] = {"status": "error", "message": str(listing)}
+            elif not listing:
+                results[username] = {"status": "skipped", "message": "No active keys found"}
+            else:
+                updates.extend((username, key_id) for key_id in listing)
+
+        disabled: dict[str, list[str]] = {}
+        for (username, key_id), error in zip(updates, self._executor.map(self._deactivate_key, updates)):
+            if error is not None:
+                results.setdefault(username, {"status": "error", "message": str(error)})
+            else:
+                disabled.setdefault(username, []).append(key_id)
+
+        for username, key_ids in disabled.items():
+            results.setdefault(username, {"status": "success", "message": f"Disabled keys: {', '.join(key_ids)}"})
+        return {username: results[username] for username in usernames}
+
+    def _list_active_keys(self, username: str) -> list[str] | ClientError:
         try:
             keys = self.iam.list_access_keys(UserName=username)
-            for key in keys['AccessKeyMetadata']:
-                if key['Status'] == 'Active':
-                    self.iam.update_access_key(
-                        UserName=username,
-                        AccessKeyId=key['AccessKeyId'],
-                        Status='Inactive'
-                    )
-                    results.append(key['AccessKeyId'])
-            
-            if not results:
-                return {"status": "skipped", "message": "No active keys found"}
-                
-            return {"status": "success", "message": f"Disabled keys: {', '.join(results)}"}
         except ClientError as e:
-            return {"status": "error", "message": str(e)}
+            return e
+        return [key['AccessKeyId'] for key in keys['AccessKeyMetadata'] if key['Status'] == 'Active']
+
+    def _deactivate_key(self, update: tuple[str, str]) -> Optional[ClientError]:
+        username, key_id = update
+        try:
+            self.iam.update_access_key(UserName=username, AccessKeyId=key_id, Status='Inactive')
+        except ClientError as e:
+            return e
+        return None
             
     def revoke_sessions(self, target_name: str, target_type: str = 'role') -> dict:
         """
@@ -90,21 +120,7 @@ class AWSRemediator:
         Note: This is a robust way to kill active sessions.
         """
         policy_name = f"RevokeSessions-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        policy_doc = f'''{{
-            "Version": "2012-10-17",
-            "Statement": [
-                {{
-                    "Effect": "Deny",
-                    "Action": "*",
-                    "Resource": "*",
-                    "Condition": {{
-                        "DateLessThan": {{
-                            "aws:TokenIssueTime": "{datetime.utcnow().isoformat()}Z"
-                        }}
-                    }}
-                }}
-            ]
-        }}'''
+        policy_doc = _revoke_sessions_policy(f"{datetime.utcnow().isoformat()}Z")
         
         try:
             if target_type == 'role':
@@ -123,5 +139,19 @@ class AWSRemediator:
         except ClientError as e:
             return {"status": "error", "message": str(e)}
 
+
+def _revoke_sessions_policy(issued_before: str) -> str:
+    """Compact JSON policy denying everything to sessions issued before the timestamp"""
+    return orjson.dumps({
+        "Version": "2012-10-17",
+        "Statement": [{
+            "Effect": "Deny",
+            "Action": "*",
+            "Resource": "*",
+            "Condition": {"DateLessThan": {"aws:TokenIssueTime": issued_before}}
+        }]
+    }).decode()
+
+
 # Singleton instance
 aws_remediator = AWSRemediator()
@@ -0,0 +1,71 @@
+"""
+Project Athena - Shared AWS Session
+One boto3 session, and one client per service and region, for ingestion and remediation
+"""
+import boto3
+import os
+import threading
+from botocore.config import Config
+from botocore.exceptions import NoCredentialsError
+from typing import Optional
+
+from config import AWS_ENDPOINT_URL, USE_MOCK_DATA
+
+# Pooled connections per client; covers the widest fan-out of its users
+# (ingest runs 20 concurrent IAM calls, remediation 10)
+AWS_MAX_POOL_CONNECTIONS = 20
+
+# Adaptive retries back off and rate-limit client-side on throttling; idle
+# pooled connections are kept alive between calls
+CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True
+)
+
+# Endpoint for ingestion clients: AWS_ENDPOINT_URL (e.g. a local emulator)
+# outside mock mode, else the default AWS endpoint
+INGEST_ENDPOINT_URL = AWS_ENDPOINT_URL if not USE_MOCK_DATA else None
+
+_session: Optional[boto3.Session] = None
+_clients: dict[tuple[str, str, Optional[str]], object] = {}
+# boto3 sessions are not thread-safe, so clients are created under a lock;
+# the clients themselves are safe to share across threads
+_lock = threading.Lock()
+
+
+def get_client(service_name: str, region: str, endpoint_url: Optional[str] = INGEST_ENDPOINT_URL):
+    """Return the shared client for a service, region and endpoint (None: AWS default), creating it once"""
+    key = (service_name, region, endpoint_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    global _session
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            return client
+        try:
+            if _session is None:
+                _session = boto3.Session(**_session_kwargs())
+            client = _session.client(
+                service_name,
+                region_name=region,
+                endpoint_url=endpoint_url,
+                config=CLIENT_CONFIG
+            )
+        except NoCredentialsError:
+            raise RuntimeError("AWS credentials not configured")
+        _clients[key] = client
+        return client
+
+
+def _session_kwargs() -> dict:
+    session_kwargs = {}
+    access_key = os.getenv("AWS_ACCESS_KEY_ID")
+    secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+    if access_key and secret_key:
+        session_kwargs["aws_access_key_id"] = access_key
+        session_kwargs["aws_secret_access_key"] = secret_key
+    return session_kwargs
@@ -0,0 +1,67 @@
+"""
+Project Athena - API Response Cache
+Small TTL cache with per-namespace invalidation for read-heavy endpoints
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+DEFAULT_TTL_SECONDS = 5.0
+# Keys can come from request paths, so the entry count is capped (LRU beyond it)
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class TTLCache:
+    """
+    In-process cache of computed values.
+    Entries expire after a TTL and whole namespaces are cleared on writes;
+    past max_entries the least recently used entry is evicted.
+    """
+    
+    def __init__(self, default_ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_set(
+        self,
+        namespace: str,
+        key: Hashable,
+        build: Callable[[], Any],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Return the cached value for key, computing and storing it on a miss (None is never stored)"""
+        entry_key = (namespace, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(entry_key)
+                return entry[1]
+        
+        value = build()
+        if value is None:
+            # Misses would otherwise pin one entry per unknown key
+            return value
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[entry_key] = (expires_at, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop every entry in namespace, or the whole cache when omitted"""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+
+# Singleton instance
+response_cache = TTLCache()
@@ -5,12 +5,14 @@ Graph-based privilege escalation detection using DFS
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 from enum import Enum
-import json
+import functools
+import orjson
+import threading
 from pathlib import Path
 
-from core.graph import identity_graph
+from core.graph import GraphSnapshot, identity_graph
 from core.metrics import metrics
 
 DEFAULT_MIN_PRIVILEGE_DELTA = 20
@@ -26,11 +28,11 @@ class Severity(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class AttackPath:
     """Represents a detected attack path"""
     path_id: str
-    path: list[str]
+    path: tuple[str, ...]  # Shared with the memoized traversal result, never copied
     source_node: str
     target_node: str
     privilege_delta: int
@@ -40,21 +42,6 @@ class AttackPath:
     detected_at: datetime = field(default_factory=datetime.now)
     recommended_actions: list[str] = field(default_factory=list)
     auto_response_eligible: bool = False
-    
-    def to_dict(self) -> dict:
-        return {
-            "path_id": self.path_id,
-            "path": self.path,
-            "source_node": self.source_node,
-            "target_node": self.target_node,
-            "privilege_delta": self.privilege_delta,
-            "confidence_score": self.confidence_score,
-            "blast_radius": self.blast_radius,
-            "severity": self.severity.value,
-            "detected_at": self.detected_at.isoformat(),
-            "recommended_actions": self.recommended_actions,
-            "auto_response_eligible": self.auto_response_eligible
-        }
 
 
 class DetectionEngine:
@@ -67,6 +54,10 @@ class DetectionEngine:
         self._detected_paths: list[AttackPath] = []
         self._path_counter = 0
         self._response_plan_handler = None
+        # Scans run in worker threads; serialize updates to counters and history
+        self._lock = threading.Lock()
+        # Config is fixed for the process, so resolve thresholds once
+        self._auto_response_thresholds = self._load_auto_response_thresholds()
         self._load_detected_paths()
     
     def find_escalation_paths(
@@ -78,23 +69,24 @@ class DetectionEngine:
         Find all privilege escalation paths from a starting node.
         If no start node specified, scan from all low-privilege nodes.
         """
-        detected = []
-        
-        if start_node:
-            # Scan from specific node
-            paths = self._dfs_escalation(start_node, min_privilege_delta)
-            detected.extend(paths)
-        else:
-            # Scan from all low-privilege nodes
-            low_priv_nodes = self._get_low_privilege_nodes()
-            for node_id in low_priv_nodes:
-                paths = self._dfs_escalation(node_id, min_privilege_delta)
+        with self._lock:
+            detected = []
+            
+            if start_node:
+                # Scan from specific node
+                paths = self._dfs_escalation(start_node, min_privilege_delta)
                 detected.extend(paths)
-        
-        # Store and return
-        self._detected_paths.extend(detected)
-        self._save_detected_paths()
-        return detected
+            else:
+                # Scan from all low-privilege nodes
+                low_priv_nodes = self._get_low_privilege_nodes()
+                for node_id in low_priv_nodes:
+                    paths = self._dfs_escalation(node_id, min_privilege_delta)
+                    detected.extend(paths)
+            
+            # Store and return
+            self._detected_paths.extend(detected)
+            self._save_detected_paths()
+            return detected
     
     def _dfs_escalation(
         self,
@@ -106,56 +98,30 @@ class DetectionEngine:
         Returns paths where privilege increases significantly.
         """
         paths = []
-        start_privilege = identity_graph.get_privilege_level(start_node)
-        
-        visited = set()
-        stack = [(start_node, [start_node], start_privilege)]
-        
-        while stack:
-            node, path, current_priv = stack.pop()
-            
-            if node in visited:
-                continue
-            visited.add(node)
-            
-            # Get all reachable nodes
-            neighbors = identity_graph.get_neighbors(node)
-            
-            for neighbor in neighbors:
-                neighbor_priv = identity_graph.get_privilege_level(neighbor)
-                delta = neighbor_priv - start_privilege
-                
-                # Check if this is an escalation
-                if delta >= min_delta:
-                    attack_path = self._create_attack_path(
-                        path=path + [neighbor],
-                        source_node=start_node,
-                        target_node=neighbor,
-                        privilege_delta=delta
-                    )
-                    paths.append(attack_path)
-                    metrics.record_attack_path()
-                
-                # Continue DFS
-                if neighbor not in visited:
-                    stack.append((neighbor, path + [neighbor], neighbor_priv))
+        hits = _escalation_hits(start_node, min_delta, identity_graph.version)
+        # Bound once; these run for every hit
+        create_attack_path = self._create_attack_path
+        record_attack_path = metrics.record_attack_path
+        add_path = paths.append
+        for path, target_node, delta in hits:
+            attack_path = create_attack_path(
+                path=path,
+                source_node=start_node,
+                target_node=target_node,
+                privilege_delta=delta
+            )
+            add_path(attack_path)
+            record_attack_path()
         
         return paths
     
     def _get_low_privilege_nodes(self, threshold: int = LOW_PRIVILEGE_THRESHOLD) -> list[str]:
         """Get all nodes with privilege level below threshold"""
-        low_priv = []
-        graph_data = identity_graph.to_dict()
-        
-        for node in graph_data['nodes']:
-            if node.get('privilege_level', 0) < threshold:
-                low_priv.append(node['id'])
-        
-        return low_priv
+        return identity_graph.low_privilege_ids(threshold)
     
     def _create_attack_path(
         self,
-        path: list[str],
+        path: tuple[str, ...],
         source_node: str,
         target_node: str,
         privilege_delta: int
@@ -202,7 +168,7 @@ class DetectionEngine:
         
         return path
     
-    def _calculate_confidence(self, path: list[str], privilege_delta: int) -> float:
+    def _calculate_confidence(self, path: tuple[str, ...], privilege_delta: int) -> float:
         """
         Calculate confidence score (0.0 - 1.0) based on:
         - Path length (shorter = higher confidence)
@@ -226,19 +192,11 @@ class DetectionEngine:
         """
         Calculate blast radius: number of resources accessible from target.
         """
-        # Count all nodes reachable from target
-        reachable = set()
-        stack = [target_node]
-        
-        while stack:
-            node = stack.pop()
-            if node in reachable:
-                continue
-            reachable.add(node)
-            neighbors = identity_graph.get_neighbors(node)
-            stack.extend(neighbors)
-        
-        return len(reachable)
+        graph = identity_graph.snapshot()
+        target = graph.index.get(target_node)
+        if target is None:
+            return 1  # An unknown target reaches only itself
+        return _blast_radii(graph)[target]
     
     def _determine_severity(
         self,
@@ -264,7 +222,7 @@ class DetectionEngine:
     
     def _generate_recommendations(
         self,
-        path: list[str],
+        path: tuple[str, ...],
         severity: Severity
     ) -> list[str]:
         """Generate response recommendations based on path"""
@@ -283,8 +241,10 @@ class DetectionEngine:
             recommendations.append("Monitor for repeated escalation attempts")
             recommendations.append("Audit policy attachments")
         
-        # Add path-specific recommendations
+        # Add path-specific recommendations; later ones would be cut anyway
         for node in path:
+            if len(recommendations) >= MAX_RECOMMENDATIONS:
+                break
             if 'role:' in node:
                 recommendations.append(f"Review trust policy for {node}")
             if 'policy:' in node:
@@ -302,39 +262,38 @@ class DetectionEngine:
         Determine if attack path is eligible for automated response.
         Uses severity-based thresholds from config.
         """
+        # If no threshold defined for this severity, require manual approval
+        min_confidence = self._auto_response_thresholds[severity]
+        return min_confidence is not None and confidence >= min_confidence
+
+    @staticmethod
+    def _load_auto_response_thresholds() -> dict[Severity, Optional[float]]:
+        """Minimum confidence for auto-response by severity, None where never automatic"""
         try:
             from config import AUTO_RESPONSE_CONFIG
-            
-            if not AUTO_RESPONSE_CONFIG.get("enabled", False):
-                return False
-            
-            # Get thresholds for this severity level
-            thresholds = AUTO_RESPONSE_CONFIG.get("severity_thresholds", {})
-            min_confidence = thresholds.get(severity.value.upper())
-            
-            # If no threshold defined for this severity, require manual approval
-            if min_confidence is None:
-                return False
-            
-            # Check if confidence meets threshold
-            return confidence >= min_confidence
-            
         except ImportError:
             # Fallback if config not available: very conservative
-            return severity == Severity.CRITICAL and confidence >= 0.95
+            return {severity: 0.95 if severity == Severity.CRITICAL else None for severity in Severity}
+
+        if not AUTO_RESPONSE_CONFIG.get("enabled", False):
+            return dict.fromkeys(Severity)
+        thresholds = AUTO_RESPONSE_CONFIG.get("severity_thresholds", {})
+        return {severity: thresholds.get(severity.value.upper()) for severity in Severity}
     
-    def get_all_alerts(self) -> list[dict]:
+    # Alert getters return the dataclasses themselves; orjson serializes them
+    # directly at the API boundary without an intermediate to_dict() pass.
+    def get_all_alerts(self) -> list[AttackPath]:
         """Get all detected attack paths"""
-        return [p.to_dict() for p in self._detected_paths]
+        return list(self._detected_paths)
     
-    def get_alert_by_id(self, path_id: str) -> Optional[dict]:
+    def get_alert_by_id(self, path_id: str) -> Optional[AttackPath]:
         """Get specific alert by ID"""
         for path in self._detected_paths:
             if path.path_id == path_id:
-                return path.to_dict()
+                return path
         return None
     
-    def get_high_priority_alerts(self) -> list[dict]:
+    def get_high_priority_alerts(self) -> list[AttackPath]:
         """Get alerts that need immediate attention"""
         high_priority = [
             p for p in self._detected_paths
@@ -342,25 +301,25 @@ class DetectionEngine:
         ]
         # Sort by confidence (highest first)
         high_priority.sort(key=lambda x: x.confidence_score, reverse=True)
-        return [p.to_dict() for p in high_priority]
+        return high_priority
 
     def set_response_plan_handler(self, handler) -> None:
         """Inject response plan creator to avoid circular imports."""
         self._response_plan_handler = handler
 
     def _save_detected_paths(self) -> None:
-        data = [path.to_dict() for path in self._detected_paths]
-        with open(DETECTED_PATHS_FILE, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+        # orjson writes the dataclasses directly: enums as values, datetimes as ISO 8601
+        with open(DETECTED_PATHS_FILE, "wb") as file:
+            file.write(orjson.dumps(self._detected_paths, option=orjson.OPT_INDENT_2))
 
     def _load_detected_paths(self) -> None:
         if not DETECTED_PATHS_FILE.exists():
             return
 
         try:
-            with open(DETECTED_PATHS_FILE, "r", encoding="utf-8") as file:
-                data = json.load(file)
-        except (json.JSONDecodeError, OSError):
+            with open(DETECTED_PATHS_FILE, "rb") as file:
+                data = orjson.loads(file.read())
+        except (orjson.JSONDecodeError, OSError):
             return
 
         loaded = []
@@ -375,7 +334,7 @@ class DetectionEngine:
             loaded.append(
                 AttackPath(
                     path_id=item.get("path_id", ""),
-                    path=item.get("path", []),
+                    path=tuple(item.get("path", ())),
                     source_node=item.get("source_node", ""),
                     target_node=item.get("target_node", ""),
                     privilege_delta=item.get("privilege_delta", 0),
@@ -399,5 +358,213 @@ class DetectionEngine:
         self._path_counter = max_counter
 
 
+@functools.lru_cache(maxsize=1024)
+def _escalation_hits(
+    start_node: str,
+    min_delta: int,
+    graph_version: int
+) -> tuple[tuple[tuple[str, ...], str, int], ...]:
+    """
+    Traverse from start_node and return (path, target, delta) for every
+    escalation. Pure function of graph state, so it is memoized per graph
+    version and repeat scans of an unchanged graph skip the traversal.
+    """
+    hits = []
+    graph = identity_graph.snapshot()
+    start = graph.index.get(start_node)
+    if start is None:
+        return ()
+    ids, indptr, indices, privilege = graph.ids, graph.indptr, graph.indices, graph.privilege
+    start_privilege = privilege[start]
+    # A node is only worth expanding if something past it can be a hit
+    bounds = _successor_privilege_bounds(graph)
+    
+    visited = bytearray(len(ids))  # Indexed by int node id
+    # Each pushed step is a slot holding its node and the slot it came from;
+    # a path is rebuilt from these parent links only when it is reported
+    slot_nodes = [start]
+    slot_parents = [-1]
+    stack = [0]
+    # Bound once; these run for every edge walked
+    add_hit = hits.append
+    push_node = slot_nodes.append
+    push_parent = slot_parents.append
+    push_slot = stack.append
+    
+    while stack:
+        slot = stack.pop()
+        node = slot_nodes[slot]
+        
+        if visited[node]:
+            continue
+        visited[node] = 1
+        path = None  # Path to node, shared by every hit found from it
+        
+        # Get all reachable nodes
+        for neighbor in indices[indptr[node]:indptr[node + 1]]:
+            delta = privilege[neighbor] - start_privilege
+            
+            # Check if this is an escalation
+            if delta >= min_delta:
+                if path is None:
+                    path = _slot_path(slot, slot_nodes, slot_parents, ids)
+                neighbor_id = ids[neighbor]
+                add_hit((path + (neighbor_id,), neighbor_id, delta))
+            
+            # Continue DFS, skipping subtrees with nothing high enough below
+            bound = bounds[neighbor]
+            if bound is None or bound - start_privilege < min_delta:
+                continue
+            if not visited[neighbor]:
+                push_node(neighbor)
+                push_parent(slot)
+                push_slot(len(slot_nodes) - 1)
+    
+    return tuple(hits)
+
+
+def _slot_path(slot: int, slot_nodes: list[int], slot_parents: list[int], ids: tuple[str, ...]) -> tuple[str, ...]:
+    """Node ids from the DFS start to slot's node, following parent links"""
+    path = []
+    while slot >= 0:
+        path.append(ids[slot_nodes[slot]])
+        slot = slot_parents[slot]
+    path.reverse()
+    return tuple(path)
+
+
+@functools.lru_cache(maxsize=1)
+def _blast_radii(graph: GraphSnapshot) -> list[int]:
+    """
+    Number of nodes reachable from each node (itself included), by int id.
+    Computed for every node at once per snapshot: components arrive sinks
+    first, so each component's reach is its own members plus the already-known
+    reach of the components it points to. Reach sets are int bitsets over node
+    ids, each dropped once every edge into its component has been folded.
+    """
+    indptr, indices = graph.indptr, graph.indices
+    component_of = [-1] * len(graph.ids)
+    component_reach: list[int] = []
+    # Edges into each component from components not yet folded
+    component_waiting: list[int] = []
+    in_degree = [0] * len(graph.ids)
+    for successor in indices:
+        in_degree[successor] += 1
+    radii = [0] * len(graph.ids)
+
+    for members in _components_sinks_first(graph):
+        component = len(component_reach)
+        reach = 0
+        waiting = 0
+        for member in members:
+            component_of[member] = component
+            reach |= 1 << member
+            waiting += in_degree[member]
+        for member in members:
+            for successor in indices[indptr[member]:indptr[member + 1]]:
+                target = component_of[successor]
+                if target == component:
+                    waiting -= 1  # Internal edge; nothing waits on it
+                    continue
+                reach |= component_reach[target]
+                component_waiting[target] -= 1
+                if not component_waiting[target]:
+                    component_reach[target] = 0  # Last predecessor folded it in
+        count = reach.bit_count()
+        for member in members:
+            radii[member] = count
+        component_reach.append(reach if waiting else 0)
+        component_waiting.append(waiting)
+
+    return radii
+
+
+@functools.lru_cache(maxsize=1)
+def _successor_privilege_bounds(graph: GraphSnapshot) -> list[Optional[int]]:
+    """
+    Highest privilege among the nodes reachable from each node through at
+    least one edge, by int id; None for nodes with no successors. Built from
+    the same sinks-first component order as the blast radii.
+    """
+    indptr, indices, privilege = graph.indptr, graph.indices, graph.privilege
+    component_of = [-1] * len(graph.ids)
+    component_max: list[int] = []  # Highest privilege reachable, members included
+    bounds: list[Optional[int]] = [None] * len(graph.ids)
+
+    for members in _components_sinks_first(graph):
+        component = len(component_max)
+        highest = max(privilege[member] for member in members)
+        for member in members:
+            component_of[member] = component
+        for member in members:
+            for successor in indices[indptr[member]:indptr[member + 1]]:
+                if component_of[successor] != component:
+                    highest = max(highest, component_max[component_of[successor]])
+        component_max.append(highest)
+        for member in members:
+            for successor in indices[indptr[member]:indptr[member + 1]]:
+                reached = component_max[component_of[successor]]
+                if bounds[member] is None or reached > bounds[member]:
+                    bounds[member] = reached
+
+    return bounds
+
+
+def _components_sinks_first(graph: GraphSnapshot) -> Iterator[list[int]]:
+    """
+    Strongly connected components of the snapshot as lists of int ids, via
+    iterative Tarjan. A component is yielded only after every component it
+    has an edge to, so callers can fold results up from the sinks.
+    """
+    indptr, indices = graph.indptr, graph.indices
+    n = len(graph.ids)
+    order = [-1] * n  # DFS discovery order
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    counter = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, indptr[root])]
+
+        while work:
+            node, position = work[-1]
+            if position < indptr[node + 1]:
+                work[-1] = (node, position + 1)
+                successor = indices[position]
+                if order[successor] == -1:
+                    order[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = 1
+                    work.append((successor, indptr[successor]))
+                elif on_stack[successor]:
+                    low[node] = min(low[node], order[successor])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] != order[node]:
+                continue
+
+            # node roots a component; every component it reaches is done
+            members = []
+            while True:
+                member = stack.pop()
+                on_stack[member] = 0
+                members.append(member)
+                if member == node:
+                    break
+            yield members
+
+
 # Singleton instance
 detection_engine = DetectionEngine()
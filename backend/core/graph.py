@@ -2,9 +2,14 @@
 Project Athena - Identity Graph Engine
 NetworkX-based directed graph for modeling IAM relationships
 """
+import functools
 import networkx as nx
+import threading
+import time
+from array import array
 from enum import Enum
-from typing import Optional
+from itertools import compress
+from typing import Iterable, Iterator, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -45,6 +50,22 @@ class IdentityNode:
     metadata: dict = field(default_factory=dict)
 
 
+@dataclass(slots=True, frozen=True, eq=False)
+class GraphSnapshot:
+    """
+    Compressed sparse row (CSR) copy of the graph at one version.
+    Nodes are numbered 0..n-1 in graph order; the successors of node i are
+    indices[indptr[i]:indptr[i + 1]], in the same order as get_neighbors.
+    """
+    version: int
+    ids: tuple[str, ...]  # int id -> node id
+    index: dict[str, int]  # node id -> int id
+    indptr: array
+    indices: array
+    privilege: array  # privilege_level by int id
+    # Compared and hashed by identity, so caches can be keyed on a snapshot
+
+
 class IdentityGraph:
     """
     Directed graph representing cloud identity relationships.
@@ -54,9 +75,44 @@ class IdentityGraph:
     def __init__(self):
         self.graph = nx.DiGraph()
         self._node_cache: dict[str, IdentityNode] = {}
+        # node_type value -> ids of that type (dict keeps insertion order)
+        self._ids_by_type: dict[str, dict[str, None]] = {}
+        # Bumped on every mutation so readers can key caches on graph state
+        self.version = 0
+        # Serializes writers, e.g. ingest phases running on separate threads
+        self._write_lock = threading.Lock()
+        self._snapshot: Optional[GraphSnapshot] = None  # Rebuilt when version moves on
+        self._dict_cache: Optional[tuple[int, dict]] = None  # (version, to_dict() payload)
+        # Gauges read the live counts when scraped, so mutations never touch them
+        metrics.track_graph_size(nodes=lambda: self.node_count, edges=lambda: self.edge_count)
     
     def add_node(self, node: IdentityNode) -> None:
         """Add an identity node to the graph"""
+        with self._write_lock:
+            self._insert_node(node)
+            self.version += 1
+
+    def add_nodes_bulk(self, nodes: Iterable[IdentityNode]) -> None:
+        """Add many nodes with one version bump"""
+        nodes = list(nodes)
+        if not nodes:
+            return
+        with self._write_lock:
+            for node in nodes:
+                self._insert_node(node)
+            self.version += 1
+
+    def remove_node(self, node_id: str) -> None:
+        """Remove a node and its edges; a missing node is ignored"""
+        with self._write_lock:
+            node = self._node_cache.pop(node_id, None)
+            if node is None:
+                return
+            self.graph.remove_node(node_id)
+            self._ids_by_type[node.node_type.value].pop(node_id, None)
+            self.version += 1
+
+    def _insert_node(self, node: IdentityNode) -> None:
         self.graph.add_node(
             node.id,
             node_type=node.node_type.value,
@@ -66,19 +122,42 @@ class IdentityGraph:
             created_at=node.created_at.isoformat(),
             metadata=node.metadata
         )
+        previous = self._node_cache.get(node.id)
+        if previous is not None and previous.node_type != node.node_type:
+            self._ids_by_type[previous.node_type.value].pop(node.id, None)
+        identity_type = node.node_type.value
+        type_ids = self._ids_by_type.get(identity_type)
+        if type_ids is None:
+            type_ids = self._ids_by_type[identity_type] = {}
+            metrics.track_identity_count(identity_type, functools.partial(self._type_total, identity_type))
+        type_ids[node.id] = None
         self._node_cache[node.id] = node
-        self._update_metrics()
     
     def add_edge(self, source_id: str, target_id: str, edge_type: EdgeType) -> None:
         """Add a directed edge (relationship) between nodes"""
-        if source_id in self.graph and target_id in self.graph:
-            self.graph.add_edge(
-                source_id,
-                target_id,
-                edge_type=edge_type.value,
-                created_at=datetime.now().isoformat()
-            )
-            self._update_metrics()
+        with self._write_lock:
+            if source_id in self.graph and target_id in self.graph:
+                self.graph.add_edge(
+                    source_id,
+                    target_id,
+                    edge_type=edge_type.value,
+                    created_at_ns=time.time_ns()  # Epoch ns; format on read if ever needed
+                )
+                self.version += 1
+
+    def add_edges_bulk(self, edges: Iterable[tuple[str, str, EdgeType]]) -> None:
+        """Add many edges in one networkx call; like add_edge, skips missing endpoints"""
+        graph = self.graph
+        created_at_ns = time.time_ns()
+        with self._write_lock:
+            batch = [
+                (source_id, target_id, {"edge_type": edge_type.value, "created_at_ns": created_at_ns})
+                for source_id, target_id, edge_type in edges
+                if source_id in graph and target_id in graph
+            ]
+            if batch:
+                graph.add_edges_from(batch)
+                self.version += 1
     
     def get_node(self, node_id: str) -> Optional[dict]:
         """Get node data by ID"""
@@ -108,50 +187,89 @@ class IdentityGraph:
         except nx.NetworkXError:
             return []
     
+    def snapshot(self) -> GraphSnapshot:
+        """CSR snapshot of the current graph for traversals, built once per version"""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version:
+            return snapshot
+
+        with self._write_lock:
+            graph = self.graph
+            ids = tuple(graph)
+            index = {node_id: i for i, node_id in enumerate(ids)}
+            indptr = array('i', [0])
+            indices = array('i')
+            for node_id in ids:
+                indices.extend(map(index.__getitem__, graph.adj[node_id]))
+                indptr.append(len(indices))
+            privilege = array('i', (data.get('privilege_level', 0) for _, data in graph.nodes(data=True)))
+            snapshot = GraphSnapshot(self.version, ids, index, indptr, indices, privilege)
+            self._snapshot = snapshot
+        return snapshot
+
+    def low_privilege_ids(self, threshold: int) -> list[str]:
+        """Ids of nodes whose privilege level is below threshold, in graph order"""
+        snapshot = self.snapshot()
+        return list(compress(snapshot.ids, (level < threshold for level in snapshot.privilege)))
+
     def get_privilege_level(self, node_id: str) -> int:
         """Get the privilege level of a node"""
         node = self.get_node(node_id)
         return node.get('privilege_level', 0) if node else 0
     
     def to_dict(self) -> dict:
-        """Export graph as dictionary for API response"""
-        nodes = []
-        for node_id in self.graph.nodes:
-            node_data = self.graph.nodes[node_id]
-            nodes.append({
+        """Export graph as dictionary for API response (shared per version; do not mutate)"""
+        cached = self._dict_cache
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        # Built under the write lock so a concurrent ingest cannot resize the
+        # node and edge dicts mid-walk
+        with self._write_lock:
+            payload = {"nodes": list(self._iter_node_dicts()), "edges": list(self._iter_edge_dicts())}
+            self._dict_cache = (self.version, payload)
+        return payload
+
+    def nodes_of_type(self, *node_types: str) -> list[dict]:
+        """Export nodes of the given types (to_dict shape) from the type index"""
+        # Ingest phases insert from worker threads; copy the index under the lock
+        with self._write_lock:
+            nodes = [
+                self._node_cache[node_id]
+                for node_type in node_types
+                for node_id in self._ids_by_type.get(node_type, ())
+            ]
+        return [
+            {
+                "id": node.id,
+                "type": node.node_type.value,
+                "name": node.name,
+                "arn": node.arn,
+                "privilege_level": node.privilege_level
+            }
+            for node in nodes
+        ]
+
+    def _iter_node_dicts(self) -> Iterator[dict]:
+        for node_id, node_data in self.graph.nodes(data=True):
+            yield {
                 "id": node_id,
                 "type": node_data.get("node_type"),
                 "name": node_data.get("name"),
                 "arn": node_data.get("arn"),
                 "privilege_level": node_data.get("privilege_level", 0)
-            })
-        
-        edges = []
-        for source, target in self.graph.edges:
-            edge_data = self.graph.edges[source, target]
-            edges.append({
+            }
+
+    def _iter_edge_dicts(self) -> Iterator[dict]:
+        for source, target, edge_data in self.graph.edges(data=True):
+            yield {
                 "source": source,
                 "target": target,
                 "edge_type": edge_data.get("edge_type")
-            })
-        
-        return {"nodes": nodes, "edges": edges}
+            }
     
-    def _update_metrics(self) -> None:
-        """Update Prometheus metrics for graph size"""
-        metrics.set_graph_size(
-            nodes=self.graph.number_of_nodes(),
-            edges=self.graph.number_of_edges()
-        )
-        
-        # Count by node type
-        type_counts = {}
-        for node_id in self.graph.nodes:
-            node_type = self.graph.nodes[node_id].get("node_type", "unknown")
-            type_counts[node_type] = type_counts.get(node_type, 0) + 1
-        
-        for identity_type, count in type_counts.items():
-            metrics.set_identity_count(identity_type, count)
+    def _type_total(self, identity_type: str) -> int:
+        """Live node count for one type, read by the identity gauge"""
+        return len(self._ids_by_type.get(identity_type, ()))
     
     @property
     def node_count(self) -> int:
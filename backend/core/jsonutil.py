@@ -0,0 +1,18 @@
+"""
+Project Athena - JSON Helpers
+Chunked orjson encoding shared by the streaming endpoints
+"""
+from itertools import islice
+from typing import Iterable, Iterator
+
+import orjson
+
+
+def json_array_items(records: Iterable[dict], batch_size: int) -> Iterator[bytes]:
+    """Encode records as comma-separated JSON array items, batch_size at a time"""
+    records = iter(records)
+    separator = b""
+    while batch := list(islice(records, batch_size)):
+        # Strip the enclosing brackets so batches concatenate into one array
+        yield separator + orjson.dumps(batch)[1:-1]
+        separator = b","
@@ -4,6 +4,7 @@ Centralized metrics collection for monitoring
 """
 from prometheus_client import Counter, Histogram, Gauge
 import time
+from typing import Callable
 
 
 class Metrics:
@@ -11,6 +12,8 @@ class Metrics:
     
     def __init__(self):
         self.start_time = time.time()
+        # Uptime baseline, immune to wall-clock adjustments
+        self.start_monotonic = time.monotonic()
         
         # Counters
         self.events_processed = Counter(
@@ -31,6 +34,11 @@ class Metrics:
             'Total number of automated responses executed',
             ['action_type']
         )
+        self.ingest_cache_lookups = Counter(
+            'athena_ingest_cache_lookups_total',
+            'Total number of AWS ingest requests by cache result',
+            ['result']
+        )
         
         # Gauges
         self.active_identities = Gauge(
@@ -71,13 +79,17 @@ class Metrics:
     def record_response(self, action_type: str):
         self.responses_executed.labels(action_type=action_type).inc()
     
-    def set_identity_count(self, identity_type: str, count: int):
-        self.active_identities.labels(identity_type=identity_type).set(count)
+    def record_ingest_cache(self, hit: bool):
+        self.ingest_cache_lookups.labels(result="hit" if hit else "miss").inc()
     
-    def set_graph_size(self, nodes: int, edges: int):
-        self.graph_nodes.set(nodes)
-        self.graph_edges.set(edges)
-
+    def track_identity_count(self, identity_type: str, count: Callable[[], int]):
+        """Report count() for identity_type, read at scrape time"""
+        self.active_identities.labels(identity_type=identity_type).set_function(count)
+    
+    def track_graph_size(self, nodes: Callable[[], int], edges: Callable[[], int]):
+        """Report graph size from callbacks read at scrape time, not per mutation"""
+        self.graph_nodes.set_function(nodes)
+        self.graph_edges.set_function(edges)
 
 # Singleton instance
 metrics = Metrics()
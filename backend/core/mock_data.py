@@ -35,7 +35,8 @@ class MockDataGenerator:
                 'Arn': f'arn:aws:iam::123456789012:user/employees/{user_id}',
                 'CreateDate': created_date,
                 'Path': '/employees/',
-                'department': dept
+                'department': dept,
+                'privilege_level': 10
             }
             users.append(user)
             
@@ -59,7 +59,7 @@ class ActionStatus(Enum):
     ROLLED_BACK = "rolled_back"
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseAction:
     """A single response action"""
     action_id: str
@@ -86,7 +86,7 @@ class ResponseAction:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponsePlan:
     """A plan containing multiple response actions"""
     plan_id: str
@@ -309,14 +309,14 @@ class ResponseEngine:
         try:
             if action.action_type == ActionType.DISABLE_USER:
                 # target is like "user:alice" or "arn:aws:iam::.../alice"
-                username = action.target.split('/')[-1].replace('user:', '')
+                username = action.target.rpartition('/')[2].replace('user:', '')
                 result = aws_remediator.disable_user(username)
                 action.result = result['message']
                 if result['status'] == 'error':
                     raise Exception(result['message'])
             
             elif action.action_type == ActionType.DISABLE_ACCESS_KEY:
-                username = action.target.split('/')[-1].replace('user:', '')
+                username = action.target.rpartition('/')[2].replace('user:', '')
                 result = aws_remediator.disable_access_keys(username)
                 action.result = result['message']
                 if result['status'] == 'error':
@@ -335,7 +335,7 @@ class ResponseEngine:
                 
                 # Simplified strategy: If generic 'detach_policy' is called on a user/role,
                 # we try to detach known dangerous policies.
-                target_name = action.target.split('/')[-1].replace('user:', '').replace('role:', '')
+                target_name = action.target.rpartition('/')[2].replace('user:', '').replace('role:', '')
                 # This needs refinement to be precise.
                 action.result = f"Manual intervention required: Detach dangerous policies from {target_name}"
                 
@@ -347,7 +347,7 @@ class ResponseEngine:
                 action.result = f"Would remove from groups: {action.target}"
             
             elif action.action_type == ActionType.REVOKE_SESSIONS:
-                target_name = action.target.split('/')[-1].replace('user:', '').replace('role:', '')
+                target_name = action.target.rpartition('/')[2].replace('user:', '').replace('role:', '')
                 target_type = 'user' if 'user:' in action.target else 'role'
                 result = aws_remediator.revoke_sessions(target_name, target_type)
                 action.result = result['message']
@@ -363,33 +363,33 @@ class ResponseEngine:
             
             # New Identity Actions
             elif action.action_type == ActionType.ROTATE_CREDENTIALS:
-                target_name = action.target.split('/')[-1].replace('user:', '')
+                target_name = action.target.rpartition('/')[2].replace('user:', '')
                 action.result = f"Credentials rotated for {target_name} (AWS Keys disabled, user notified to create new ones)"
             
             elif action.action_type == ActionType.ENABLE_MFA_ENFORCEMENT:
-                target_name = action.target.split('/')[-1].replace('user:', '')
+                target_name = action.target.rpartition('/')[2].replace('user:', '')
                 action.result = f"MFA enforcement enabled for {target_name}"
             
             # New Policy Actions
             elif action.action_type == ActionType.REMOVE_INLINE_POLICIES:
-                target_name = action.target.split('/')[-1].replace('user:', '').replace('role:', '')
+                target_name = action.target.rpartition('/')[2].replace('user:', '').replace('role:', '')
                 action.result = f"Inline policies removed from {target_name}"
             
             elif action.action_type == ActionType.ATTACH_QUARANTINE_POLICY:
-                target_name = action.target.split('/')[-1].replace('user:', '').replace('role:', '')
+                target_name = action.target.rpartition('/')[2].replace('user:', '').replace('role:', '')
                 action.result = f"Quarantine policy attached to {target_name} (deny-all except read)"
             
             # Infrastructure Actions
             elif action.action_type == ActionType.ISOLATE_EC2_INSTANCE:
-                instance_id = action.target.split('/')[-1]
+                instance_id = action.target.rpartition('/')[2]
                 action.result = f"EC2 instance {instance_id} isolated (security group set to deny-all)"
             
             elif action.action_type == ActionType.STOP_EC2_INSTANCE:
-                instance_id = action.target.split('/')[-1]
+                instance_id = action.target.rpartition('/')[2]
                 action.result = f"EC2 instance {instance_id} stopped"
             
             elif action.action_type == ActionType.QUARANTINE_S3_BUCKET:
-                bucket_name = action.target.split('/')[-1]
+                bucket_name = action.target.rpartition('/')[2]
                 action.result = f"S3 bucket {bucket_name} quarantined (deny-all bucket policy applied)"
             
             elif action.action_type == ActionType.BLOCK_IP_ADDRESS:
@@ -532,13 +532,13 @@ class ResponseEngine:
                 return plan
         return None
     
-    def get_pending_approvals(self) -> list[dict]:
+    def get_pending_approvals(self) -> list[ResponsePlan]:
         """Get all plans pending human approval"""
-        return [p.to_dict() for p in self._pending_approvals]
+        return list(self._pending_approvals)
     
-    def get_response_history(self) -> list[dict]:
+    def get_response_history(self) -> list[ResponsePlan]:
         """Get all historical response plans"""
-        return [p.to_dict() for p in self._response_history]
+        return list(self._response_history)
 
     def _save_state(self) -> None:
         data = {
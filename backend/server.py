@@ -0,0 +1,25 @@
+"""
+Project Athena - Production Server Entrypoint
+Runs the FastAPI app under uvicorn with uvloop/httptools and configurable workers
+"""
+import os
+import sys
+
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import API_HOST, API_PORT, UVICORN_WORKERS
+
+
+if __name__ == "__main__":
+    # "auto" selects uvloop and httptools when installed and falls back to
+    # asyncio/h11 on platforms without them (e.g. Windows).
+    uvicorn.run(
+        "main:app",
+        host=API_HOST,
+        port=API_PORT,
+        workers=UVICORN_WORKERS,
+        loop="auto",
+        http="auto"
+    )
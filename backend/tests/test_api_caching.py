@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Ensure backend root is importable in CI/pytest environments.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from main import app
+from core.graph import identity_graph, IdentityNode, NodeType
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def etag_probe():
+    node_id = "user:etag_probe"
+    yield node_id
+    identity_graph.remove_node(node_id)
+
+
+def test_graph_stats_returns_304_for_matching_etag():
+    first = client.get("/api/graph/stats")
+    etag = first.headers["etag"]
+
+    cached = client.get("/api/graph/stats", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+def test_graph_etag_changes_after_mutation(etag_probe):
+    etag = client.get("/api/graph").headers["etag"]
+
+    identity_graph.add_node(IdentityNode(
+        id=etag_probe,
+        node_type=NodeType.IAM_USER,
+        name="etag_probe",
+        arn="arn:aws:iam::123456789012:user/etag_probe"
+    ))
+
+    response = client.get("/api/graph", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert any(node["id"] == etag_probe for node in response.json()["nodes"])
+
+
+def test_ttl_cache_clear_invalidates_namespace():
+    from core.cache import TTLCache
+
+    cache = TTLCache(default_ttl=60)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_set("alerts", "all", build) == 1
+    assert cache.get_or_set("alerts", "all", build) == 1
+    cache.get_or_set("response", "pending", build)
+
+    cache.clear("alerts")
+    assert cache.get_or_set("alerts", "all", build) == 3
+    assert cache.get_or_set("response", "pending", build) == 2
+
+
+def test_ttl_cache_skips_none_and_evicts_least_recent():
+    from core.cache import TTLCache
+
+    cache = TTLCache(default_ttl=60, max_entries=2)
+    assert cache.get_or_set("alerts", "alert:missing", lambda: None) is None
+    assert cache.get_or_set("alerts", "alert:missing", lambda: "found") == "found"
+
+    cache.get_or_set("alerts", "a", lambda: "a")
+    cache.get_or_set("alerts", "alert:missing", lambda: "rebuilt")  # refreshes its recency
+    cache.get_or_set("alerts", "b", lambda: "b")
+    assert cache.get_or_set("alerts", "alert:missing", lambda: "rebuilt") == "found"
+    assert cache.get_or_set("alerts", "a", lambda: "rebuilt") == "rebuilt"
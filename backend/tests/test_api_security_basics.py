@@ -30,3 +30,21 @@ def test_register_rejects_weak_password():
 def test_pending_response_requires_auth():
     response = client.get("/api/response/pending")
     assert response.status_code == 401
+
+
+def test_login_is_rate_limited():
+    form = {"username": "nobody", "password": "not-a-real-password"}
+    statuses = [client.post("/api/auth/login", data=form).status_code for _ in range(21)]
+    assert statuses[:20] == [401] * 20
+    assert statuses[20] == 429
+
+
+def test_access_token_is_standard_jwt():
+    import jwt
+    import config
+    from core.auth import auth_manager
+
+    token = auth_manager.create_access_token({"sub": "analyst1", "role": "analyst"})
+    payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
+    assert payload["sub"] == "analyst1"
+    assert auth_manager.verify_token(token)["role"] == "analyst"
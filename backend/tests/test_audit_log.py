@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import orjson
+
+# Ensure backend root is importable in CI/pytest environments.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.audit import AuditLogger
+
+
+def test_legacy_json_array_is_imported_once(tmp_path):
+    legacy = [
+        {"id": "LOG-000001", "timestamp": "2025-01-02T03:04:05.123456", "action": "SCAN",
+         "actor": "admin", "target": None, "status": "success", "details": None},
+        {"id": "LOG-000007", "timestamp": "2025-01-02T03:05:00", "action": "LOGIN",
+         "actor": "alice", "target": "api", "status": "failure", "details": "bad password"},
+    ]
+    (tmp_path / "audit_logs.json").write_bytes(orjson.dumps(legacy))
+    log_path = tmp_path / "audit_logs.jsonl"
+
+    audit = AuditLogger(log_path=log_path)
+    assert [entry["id"] for entry in audit.get_logs()] == ["LOG-000007", "LOG-000001"]
+    assert audit.get_logs()[1]["timestamp"] == "2025-01-02T03:04:05.123456"
+
+    audit.log("RESPOND", "admin")
+    audit.close()
+    assert audit.get_logs()[0]["id"] == "LOG-000008"
+
+    # The JSONL file now owns the history; the legacy array is not re-imported
+    reloaded = AuditLogger(log_path=log_path)
+    assert [entry["id"] for entry in reloaded.get_logs()] == ["LOG-000008", "LOG-000007", "LOG-000001"]
+    reloaded.close()
+
+
+def test_unserializable_entry_does_not_stop_the_writer(tmp_path):
+    log_path = tmp_path / "audit_logs.jsonl"
+    audit = AuditLogger(log_path=log_path)
+
+    audit.log("SCAN", "admin", details={"paths": {1, 2}})
+    audit.log("LOGIN", "alice")
+    assert audit.flush(timeout=5)
+    audit.close(timeout=5)
+
+    lines = log_path.read_bytes().splitlines()
+    assert [orjson.loads(line)["action"] for line in lines] == ["SCAN", "LOGIN"]
+
+
+def test_reads_render_only_the_cached_window(tmp_path, monkeypatch):
+    import core.audit as audit_module
+
+    monkeypatch.setattr(audit_module, "AUDIT_READ_CACHE_SIZE", 3)
+    log_path = tmp_path / "audit_logs.jsonl"
+    log_path.write_bytes(b"".join(
+        orjson.dumps({"id": i, "timestamp": i, "action": f"A{i}", "actor": "admin",
+                      "target": None, "status": "success", "details": None}) + b"\n"
+        for i in range(1, 11)
+    ))
+    audit = AuditLogger(log_path=log_path)
+    assert audit._recent.maxlen == 3
+
+    rendered = []
+    original = audit_module.AuditLog.to_dict
+    monkeypatch.setattr(audit_module.AuditLog, "to_dict", lambda entry: rendered.append(entry.id) or original(entry))
+
+    assert [entry["action"] for entry in audit.get_logs(limit=2)] == ["A10", "A9"]
+    assert rendered == [8, 9, 10]
+
+    # Deeper reads still walk the full history, newest first
+    assert [entry["id"] for entry in audit.get_logs(limit=5)][-1] == "LOG-000006"
+    assert len(audit.get_logs(limit=None)) == 10
+    audit.close()
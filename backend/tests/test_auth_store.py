@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+import orjson
+
+# Ensure backend root is importable in CI/pytest environments.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import core.auth as auth
+from core.auth import AuthManager
+
+PASSWORD = "Sup3r-Secret-Pass!"
+
+
+def test_created_user_survives_restart_and_can_log_in(tmp_path):
+    db_path = str(tmp_path / "users.json")
+    store = AuthManager(db_path=db_path)
+    assert store.create_user("alice", PASSWORD)
+    assert store.update_user_role("alice", "admin")
+
+    restarted = AuthManager(db_path=db_path)
+    user = restarted.get_user("alice")
+    assert user["role"] == "admin"
+    assert restarted.verify_password(PASSWORD, user["hashed_password"])
+
+
+def test_journal_replay_is_idempotent(tmp_path):
+    db_path = str(tmp_path / "users.json")
+    store = AuthManager(db_path=db_path)
+    store.create_user("alice", PASSWORD)
+    store.create_user("bob", PASSWORD)
+    store.delete_user("bob")
+    store.update_user_role("alice", "admin")
+
+    # Replaying every record a second time, as after a crash between the
+    # compaction snapshot and journal truncation, must not change the result
+    journal = Path(store.journal_path)
+    journal.write_bytes(journal.read_bytes() * 2)
+
+    restarted = AuthManager(db_path=db_path)
+    assert restarted.list_users() == [{"username": "alice", "role": "admin"}]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "USERS_JOURNAL_COMPACT_BYTES", 1)
+    db_path = str(tmp_path / "users.json")
+    store = AuthManager(db_path=db_path)
+    store.create_user("alice", PASSWORD)
+    store.create_user("bob", PASSWORD, role="admin")
+
+    assert Path(store.journal_path).read_bytes() == b""
+    snapshot = orjson.loads(Path(db_path).read_bytes())
+    assert {name: user["role"] for name, user in snapshot.items()} == {"alice": "analyst", "bob": "admin"}
+
+    restarted = AuthManager(db_path=db_path)
+    assert restarted.verify_password(PASSWORD, restarted.get_user("bob")["hashed_password"])
+    assert restarted.list_users() == store.list_users()
+
+
+def test_tokens_verify_with_the_secret_they_were_signed_with(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth.config, "JWT_SECRET", "rotated-secret-for-tests")
+    store = AuthManager(db_path=str(tmp_path / "users.json"))
+
+    token = store.create_access_token({"sub": "alice", "role": "analyst"})
+    assert store.verify_token(token)["sub"] == "alice"
+    assert auth.auth_manager.verify_token(token) is None
+
+
+def test_concurrent_delete_and_create_journal_in_memory_order(tmp_path, monkeypatch):
+    import threading
+
+    db_path = str(tmp_path / "users.json")
+    store = AuthManager(db_path=db_path)
+    store.create_user("carol", PASSWORD)
+
+    # Hold the delete between its in-memory change and its journal append
+    # while a register for the same name runs
+    deleted, created = threading.Event(), threading.Event()
+    apply_mutation = AuthManager._apply_mutation
+
+    def paused_apply(users, record):
+        apply_mutation(users, record)
+        if record["op"] == "delete":
+            deleted.set()
+            created.wait(timeout=0.5)
+
+    monkeypatch.setattr(AuthManager, "_apply_mutation", staticmethod(paused_apply))
+
+    def register():
+        deleted.wait(timeout=5)
+        store.create_user("carol", PASSWORD)
+        created.set()
+
+    registrar = threading.Thread(target=register)
+    registrar.start()
+    assert store.delete_user("carol")
+    registrar.join()
+
+    assert store.get_user("carol") is not None
+    assert AuthManager(db_path=db_path).list_users() == store.list_users()
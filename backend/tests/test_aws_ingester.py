@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure backend root is importable in CI/pytest environments.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import core.aws_ingester as aws_ingester_module
+from core.aws_ingester import AWSIngester
+from core.graph import EdgeType, identity_graph
+
+POLICY_ARN = "arn:aws:iam::123456789012:policy/DeployPolicy"
+ROLE_ARN = "arn:aws:iam::123456789012:role/AdminRole"
+
+
+class _Paginator:
+    def __init__(self, pages):
+        self._pages = pages
+
+    def paginate(self, **kwargs):
+        return iter(self._pages)
+
+
+class FakeIAM:
+    """Just enough of the IAM client for one user, one role and one managed policy"""
+
+    def __init__(self):
+        self.default_version = "v1"
+        self.documents = {
+            "v1": {"Statement": [{"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}]},
+            "v2": {"Statement": [{"Effect": "Allow", "Action": "sts:AssumeRole", "Resource": ROLE_ARN}]},
+        }
+
+    def get_paginator(self, operation):
+        policy = {"PolicyName": "DeployPolicy", "PolicyId": "ANPA1", "Arn": POLICY_ARN, "DefaultVersionId": self.default_version}
+        pages = {
+            "list_users": [{"Users": [{"UserName": "alice", "UserId": "AIDA1", "Arn": "arn:aws:iam::123456789012:user/alice"}]}],
+            "list_roles": [{"Roles": [{"RoleName": "AdminRole", "RoleId": "AROA1", "Arn": ROLE_ARN}]}],
+            "list_groups": [{"Groups": []}],
+            "list_policies": [{"Policies": [policy]}],
+        }
+        return _Paginator(pages[operation])
+
+    def list_attached_user_policies(self, UserName):
+        return {"AttachedPolicies": [{"PolicyName": "DeployPolicy", "PolicyArn": POLICY_ARN}]}
+
+    def list_attached_role_policies(self, RoleName):
+        return {"AttachedPolicies": []}
+
+    def get_policy(self, PolicyArn):
+        return {"Policy": {"DefaultVersionId": self.default_version}}
+
+    def get_policy_version(self, PolicyArn, VersionId):
+        return {"PolicyVersion": {"Document": self.documents[VersionId]}}
+
+
+@pytest.fixture
+def fake_account_nodes():
+    yield
+    for node_id in ("user:alice", "role:AdminRole", "policy:DeployPolicy"):
+        identity_graph.remove_node(node_id)
+
+
+def test_new_default_policy_version_is_picked_up_on_refresh(tmp_path, monkeypatch, fake_account_nodes):
+    monkeypatch.setattr(aws_ingester_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(aws_ingester_module, "POLICY_CACHE_FILE", tmp_path / "policy_cache.json")
+
+    iam = FakeIAM()
+    ingester = AWSIngester()
+    ingester._iam_client = iam
+
+    ingester.ingest_all()
+    assert not identity_graph.graph.has_edge("user:alice", "role:AdminRole")
+
+    iam.default_version = "v2"
+    ingester.ingest_all(force_refresh=True)
+    assert identity_graph.graph["user:alice"]["role:AdminRole"]["edge_type"] == EdgeType.CAN_ASSUME.value
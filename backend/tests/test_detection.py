@@ -0,0 +1,134 @@
+import random
+import sys
+from array import array
+from pathlib import Path
+
+# Ensure backend root is importable in CI/pytest environments.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import pytest
+
+import core.detection as detection
+from core.detection import DetectionEngine, LOW_PRIVILEGE_THRESHOLD, _blast_radii
+from core.graph import EdgeType, GraphSnapshot, IdentityNode, NodeType, identity_graph
+
+
+def _random_adjacency(rnd: random.Random, n: int) -> list[list[int]]:
+    adjacency = [set() for _ in range(n)]
+    for _ in range(n * rnd.randint(1, 3)):
+        adjacency[rnd.randrange(n)].add(rnd.randrange(n))
+    return [sorted(successors) for successors in adjacency]
+
+
+def _snapshot(adjacency: list[list[int]]) -> GraphSnapshot:
+    indptr, indices = array("i", [0]), array("i")
+    for successors in adjacency:
+        indices.extend(successors)
+        indptr.append(len(indices))
+    ids = tuple(f"node:{i}" for i in range(len(adjacency)))
+    return GraphSnapshot(
+        version=0,
+        ids=ids,
+        index={node_id: i for i, node_id in enumerate(ids)},
+        indptr=indptr,
+        indices=indices,
+        privilege=array("i", [0] * len(adjacency)),
+    )
+
+
+def _reach_count(adjacency: list[list[int]], start: int) -> int:
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        node = frontier.pop()
+        for successor in adjacency[node]:
+            if successor not in seen:
+                seen.add(successor)
+                frontier.append(successor)
+    return len(seen)
+
+
+def test_blast_radii_match_per_node_search():
+    for seed in range(50):
+        rnd = random.Random(seed)
+        adjacency = _random_adjacency(rnd, rnd.randint(1, 80))
+        expected = [_reach_count(adjacency, node) for node in range(len(adjacency))]
+        assert _blast_radii(_snapshot(adjacency)) == expected
+
+
+def _reference_escalations(start_node: str, min_delta: int) -> list[tuple]:
+    """The original escalation DFS over the live graph: (path, target, delta) per hit"""
+    hits = []
+    start_privilege = identity_graph.get_privilege_level(start_node)
+    visited = set()
+    stack = [(start_node, [start_node])]
+    while stack:
+        node, path = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        for neighbor in identity_graph.get_neighbors(node):
+            delta = identity_graph.get_privilege_level(neighbor) - start_privilege
+            if delta >= min_delta:
+                hits.append((path + [neighbor], neighbor, delta))
+            if neighbor not in visited:
+                stack.append((neighbor, path + [neighbor]))
+    return hits
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(detection, "DETECTED_PATHS_FILE", tmp_path / "detected_paths.json")
+    added = []
+    yield DetectionEngine(), added
+    for node_id in added:
+        identity_graph.remove_node(node_id)
+
+
+def _load_random_graph(rnd: random.Random, prefix: str, added: list[str]) -> list[str]:
+    n = rnd.randint(5, 40)
+    # Few distinct levels, so equal-privilege neighbours and chains are common
+    levels = [0, 10, 10, 20, 50, 50, 75, 90, 100]
+    node_ids = [f"user:{prefix}{i}" for i in range(n)]
+    identity_graph.add_nodes_bulk(
+        IdentityNode(id=node_id, node_type=NodeType.IAM_USER, name=node_id, arn=node_id,
+                     privilege_level=rnd.choice(levels))
+        for node_id in node_ids
+    )
+    added.extend(node_ids)
+    edges = [(rnd.choice(node_ids), rnd.choice(node_ids), EdgeType.CAN_ASSUME) for _ in range(n * rnd.randint(1, 3))]
+    # A cycle through the first few nodes, and an equal-privilege chain behind it
+    ring = node_ids[:4]
+    edges += [(a, b, EdgeType.CAN_ASSUME) for a, b in zip(ring, ring[1:] + ring[:1])]
+    edges += [(a, b, EdgeType.MEMBER_OF) for a, b in zip(node_ids[3:8], node_ids[4:9])]
+    identity_graph.add_edges_bulk(edges)
+    return node_ids
+
+
+def test_escalation_paths_match_reference_dfs(engine):
+    detection_engine, added = engine
+    for seed in range(15):
+        rnd = random.Random(seed)
+        node_ids = _load_random_graph(rnd, f"esc{seed}_", added)
+        for start_node in node_ids:
+            for min_delta in (-10, 0, 30, 60):
+                found = detection_engine.find_escalation_paths(start_node=start_node, min_privilege_delta=min_delta)
+                assert [(list(p.path), p.target_node, p.privilege_delta) for p in found] == \
+                    _reference_escalations(start_node, min_delta)
+        # Every scan re-persists the history; keep it from growing across graphs
+        detection_engine._detected_paths.clear()
+
+
+def test_full_scan_matches_reference_dfs(engine):
+    detection_engine, added = engine
+    rnd = random.Random(7)
+    _load_random_graph(rnd, "scan_", added)
+
+    expected = [
+        hit
+        for node in identity_graph.to_dict()["nodes"]
+        if node["privilege_level"] < LOW_PRIVILEGE_THRESHOLD
+        for hit in _reference_escalations(node["id"], 30)
+    ]
+    found = detection_engine.find_escalation_paths(min_privilege_delta=30)
+    assert [(list(p.path), p.target_node, p.privilege_delta) for p in found] == expected